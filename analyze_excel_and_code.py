@@ -1,13 +1,6 @@
 import pandas as pd
 from calculation_formulas import GunDrillTimeCalculator
-
-# Load the GUNDRILL data
-try:
-    df_gundrill = pd.read_csv("/home/ubuntu/GUNDRILL.csv")
-    print("GUNDRILL.csv loaded successfully.")
-except Exception as e:
-    print(f"Error loading GUNDRILL.csv: {e}")
-    exit()
+from incremental_processing import IncrementalProcessor
 
 # Initialize the calculator
 calculator = GunDrillTimeCalculator()
@@ -22,15 +15,14 @@ def clean_time_string(time_str):
     except ValueError:
         return None
 
-# Iterate through the GUNDRILL data and compare calculations
-results = []
-for index, row in df_gundrill.iterrows():
+# Compare one GUNDRILL row against the calculator (None for skipped rows)
+def compare_gundrill_row(row, index):
     matl_grade = str(row["MATL GRADE"]).strip() if pd.notna(row["MATL GRADE"]) else None
     drill_size_str = str(row["DRILL SIZE"]).replace("\"", "").strip()
     
     # Skip rows that don't have a material grade or drill size (these are often headers or empty rows)
     if not matl_grade or not drill_size_str:
-        continue
+        return None
 
     try:
         drill_size = float(drill_size_str)
@@ -146,7 +138,7 @@ for index, row in df_gundrill.iterrows():
         )
         calculated_total_standard_time_10_inch = calculated_total_standard_time_10_inch_dict.get("total_standard_time")
 
-        results.append({
+        return {
             "MATL GRADE": matl_grade,
             "DRILL SIZE": drill_size,
             "RPM": rpm,
@@ -162,36 +154,21 @@ for index, row in df_gundrill.iterrows():
             "Calculated Setup Time (Python)": calculated_setup_time,
             "Excel Inspection Time (mins)": excel_wall_thickness_insp,
             "Calculated Inspection Time (Python)": calculated_inspection_time
-        })
+        }
 
     except ValueError as ve:
-        print(f"Skipping row {index} due to data conversion error: {ve} in row: {row.to_dict()}")
+        print(f"Skipping row {index} due to data conversion error: {ve} in row: {row}")
     except Exception as ex:
-        print(f"Skipping row {index} due to unexpected error: {ex} in row: {row.to_dict()}")
-
-df_results = pd.DataFrame(results)
-print("\nComparison Results:")
-print(df_results.to_string())
-
-# Save results to a CSV for further analysis
-df_results.to_csv("/home/ubuntu/comparison_results_gundrill.csv", index=False)
-print("Comparison results saved to /home/ubuntu/comparison_results_gundrill.csv")
-
-# Now, let's analyze FMJ-PORT.csv
-try:
-    df_fmjport = pd.read_csv("/home/ubuntu/FMJ-PORT.csv")
-    print("\nFMJ-PORT.csv loaded successfully.")
-except Exception as e:
-    print(f"Error loading FMJ-PORT.csv: {e}")
-    exit()
+        print(f"Skipping row {index} due to unexpected error: {ex} in row: {row}")
+    return None
 
-fmj_results = []
-for index, row in df_fmjport.iterrows():
+# Compare one FMJ-PORT row against the calculator (None for skipped rows)
+def compare_fmj_port_row(row, index):
     matl_grade = str(row["FMJ PORT-LOW CHROME MATERIAL"]).strip() if pd.notna(row["FMJ PORT-LOW CHROME MATERIAL"]) else None
     operation = str(row["OPERATION"]).strip() if pd.notna(row["OPERATION"]) else None
     
     if not matl_grade and not operation:
-        continue
+        return None
 
     try:
         # The FMJ-PORT sheet has different columns and likely different calculation logic.
@@ -228,7 +205,7 @@ for index, row in df_fmjport.iterrows():
                 feed_rate=feed_rate_fmj_mm_min,
                 material_grade=matl_grade
             )
-            fmj_results.append({
+            return {
                 "MATL GRADE": matl_grade,
                 "OPERATION": operation,
                 "LENGTH": length_fmj,
@@ -236,9 +213,9 @@ for index, row in df_fmjport.iterrows():
                 "FEED RATE": feed_rate_fmj,
                 "Excel Time Taken (mins)": excel_time_taken_fmj,
                 "Calculated Cutting Time (mins)": calculated_cutting_time_fmj
-            })
+            }
         else:
-            fmj_results.append({
+            return {
                 "MATL GRADE": matl_grade,
                 "OPERATION": operation,
                 "LENGTH": row["LENGTH"],
@@ -246,12 +223,44 @@ for index, row in df_fmjport.iterrows():
                 "FEED RATE": row["FEED RATE"],
                 "Excel Time Taken (mins)": clean_time_string(row["TIME TAKEN"]),
                 "Calculated Cutting Time (mins)": "N/A (Non-Drill Operation)"
-            })
+            }
 
     except ValueError as ve:
-        print(f"Skipping row {index} in FMJ-PORT due to data conversion error: {ve} in row: {row.to_dict()}")
+        print(f"Skipping row {index} in FMJ-PORT due to data conversion error: {ve} in row: {row}")
     except Exception as ex:
-        print(f"Skipping row {index} in FMJ-PORT due to unexpected error: {ex} in row: {row.to_dict()}")
+        print(f"Skipping row {index} in FMJ-PORT due to unexpected error: {ex} in row: {row}")
+    return None
+
+# Load the GUNDRILL data and compare calculations.
+# Results are cached per row fingerprint, so only edited rows are recomputed.
+gundrill_processor = IncrementalProcessor(
+    "/home/ubuntu/.gundrill_comparison_cache.json", compare_gundrill_row, calculator, name="GUNDRILL"
+)
+try:
+    results = [result for result in gundrill_processor.run_csv("/home/ubuntu/GUNDRILL.csv") if result is not None]
+    print(f"GUNDRILL.csv loaded successfully ({gundrill_processor.last_run_stats['recomputed']} rows recomputed).")
+except Exception as e:
+    print(f"Error loading GUNDRILL.csv: {e}")
+    exit()
+
+df_results = pd.DataFrame(results)
+print("\nComparison Results:")
+print(df_results.to_string())
+
+# Save results to a CSV for further analysis
+df_results.to_csv("/home/ubuntu/comparison_results_gundrill.csv", index=False)
+print("Comparison results saved to /home/ubuntu/comparison_results_gundrill.csv")
+
+# Now, let's analyze FMJ-PORT.csv
+fmj_port_processor = IncrementalProcessor(
+    "/home/ubuntu/.fmj_port_comparison_cache.json", compare_fmj_port_row, calculator, name="FMJ-PORT"
+)
+try:
+    fmj_results = [result for result in fmj_port_processor.run_csv("/home/ubuntu/FMJ-PORT.csv") if result is not None]
+    print(f"\nFMJ-PORT.csv loaded successfully ({fmj_port_processor.last_run_stats['recomputed']} rows recomputed).")
+except Exception as e:
+    print(f"Error loading FMJ-PORT.csv: {e}")
+    exit()
 
 df_fmj_results = pd.DataFrame(fmj_results)
 print("\nFMJ-PORT Comparison Results:")
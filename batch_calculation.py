@@ -0,0 +1,449 @@
+"""
+Gun Drill Machine Standard Time Calculator - Vectorized Batch Calculation
+This module evaluates the GunDrillTimeCalculator business logic over whole
+columns of inputs at once with numpy, either reproducing the reference
+round-as-you-go results or in the exact integer fixed-point mode.
+"""
+
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from calculation_formulas import (
+    GunDrillTimeCalculator,
+    FIXED_POINT_UNITS_PER_MINUTE,
+    OUTPUT_UNITS_PER_MINUTE,
+    FIXED_POINT_FACTOR_SCALE,
+    HARD_MATERIALS,
+    to_fixed_point,
+    from_fixed_point,
+)
+
+# Intermediates up to this magnitude stay in int64 in the exact mode; rows
+# beyond it fall back to Python ints (half the int64 range leaves headroom
+# for the floating point estimate)
+INT64_SAFE_LIMIT = 2.0 ** 62
+INT64_MAX = np.iinfo(np.int64).max
+
+# Output fields produced by calculate_total_standard_time, in order
+RESULT_FIELDS = (
+    'cutting_time_per_feature',
+    'total_cutting_time',
+    'setup_time',
+    'grinding_time_per_feature',
+    'total_grinding_time',
+    'inspection_time',
+    'tool_wear_factor_applied',
+    'tool_wear_additional_time',
+    'total_standard_time',
+    'number_of_features',
+)
+
+
+def round_half_even_like_python(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
+    """
+    Round an array exactly like Python's built-in round(value, ndigits).
+
+    np.round scales by 10**ndigits before rounding, which can disagree with
+    round() for values whose scaled form sits on a .5 boundary. Those rare
+    values are detected and re-rounded with the built-in.
+
+    Args:
+        values: Array of floats
+        ndigits: Number of decimal places
+
+    Returns:
+        Rounded float64 array
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        index = np.flatnonzero(near_tie)
+        rounded.flat[index] = [round(float(v), ndigits) for v in values.flat[index]]
+    return rounded
+
+
+def to_fixed_point_array(minutes: np.ndarray) -> np.ndarray:
+    """Vectorized calculation_formulas.to_fixed_point."""
+    return np.rint(minutes * FIXED_POINT_UNITS_PER_MINUTE).astype(np.int64)
+
+
+def fixed_point_div_round_array(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    """Vectorized calculation_formulas.fixed_point_div_round."""
+    return (numerator + denominator // 2) // denominator
+
+
+def from_fixed_point_array(units: np.ndarray) -> np.ndarray:
+    """Vectorized calculation_formulas.from_fixed_point."""
+    step = FIXED_POINT_UNITS_PER_MINUTE // OUTPUT_UNITS_PER_MINUTE
+    return fixed_point_div_round_array(units, step) / OUTPUT_UNITS_PER_MINUTE
+
+
+def sum_units(units: np.ndarray) -> int:
+    """Exact integer sum of fixed-point units, without int64 wrap-around."""
+    units = np.asarray(units)
+    if units.dtype != object and float(np.abs(units).max(initial=0)) * units.size < INT64_SAFE_LIMIT:
+        return int(units.sum())
+    return sum(int(value) for value in units.ravel().tolist())
+
+
+def build_material_table(material_factors: Dict[str, float]) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+    """
+    Precompile a material factor dictionary into lookup arrays.
+
+    The last entry of each array is the fallback used for unknown materials.
+
+    Args:
+        material_factors: Lower-case material name to cutting factor
+
+    Returns:
+        Tuple of (material names, factor array, hard material flag array)
+    """
+    names = tuple(material_factors)
+    factors = np.array([material_factors[name] for name in names] + [1.0], dtype=np.float64)
+    hard = np.array([name in HARD_MATERIALS for name in names] + [False], dtype=bool)
+    return names, factors, hard
+
+
+def encode_materials(material_grade: Any, names: Sequence[str]) -> np.ndarray:
+    """
+    Map material grades to indices into a material table.
+
+    Args:
+        material_grade: Single material or array of materials (any case)
+        names: Lower-case material names from build_material_table
+
+    Returns:
+        Integer code array; unknown materials map to len(names)
+    """
+    grades = np.asarray(material_grade, dtype=object)
+    unique, inverse = np.unique(grades.ravel(), return_inverse=True)
+    lookup = {name: code for code, name in enumerate(names)}
+    unique_codes = np.array(
+        [lookup.get(str(grade).lower(), len(names)) for grade in unique], dtype=np.intp
+    )
+    return unique_codes[inverse].reshape(grades.shape)
+
+
+def optional_column(values: Optional[Any], size: int) -> np.ndarray:
+    """Return a float column where NaN marks 'not provided'."""
+    if values is None:
+        return np.full(size, np.nan)
+    column = np.array(values, dtype=np.float64)
+    return np.broadcast_to(column, (size,)) if column.ndim == 0 else column
+
+
+def compute_standard_times(drill_size: np.ndarray,
+                           length_to_drill: np.ndarray,
+                           rpm: np.ndarray,
+                           feed_rate: np.ndarray,
+                           material_factor: np.ndarray,
+                           hard_material: np.ndarray,
+                           number_of_features: np.ndarray,
+                           tool_wear_consideration: np.ndarray,
+                           wall_thickness_inspection: np.ndarray,
+                           custom_setup_time: np.ndarray,
+                           custom_grinding_time: np.ndarray,
+                           grinding_frequency: np.ndarray,
+                           default_setup_time: Any,
+                           default_grinding_time: Any,
+                           default_inspection_time: Any,
+                           tool_wear_factor: Any,
+                           exact: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Vectorized kernel for calculate_total_standard_time.
+
+    Materials must already be resolved to factors. Calculator parameters may
+    be scalars or per-row arrays, which lets one call serve mixed profiles.
+    The floating point operations follow the reference methods step for step
+    so the non-exact results are bit-for-bit identical.
+
+    Returns:
+        Dictionary of result arrays keyed like calculate_total_standard_time
+    """
+    features = number_of_features
+    length_ratio = length_to_drill / 1000
+
+    # Cutting time: Length / Feed Rate with material, size and RPM factors
+    size_factor = np.where(drill_size <= 5, 1.1,
+                  np.where(drill_size <= 10, 1.0,
+                  np.where(drill_size <= 20, 1.05, 1.15)))
+    optimal_rpm = (40 * 1000) / (np.pi * drill_size)
+    rpm_ratio = rpm / optimal_rpm
+    optimal = (rpm_ratio >= 0.8) & (rpm_ratio <= 1.2)
+    suboptimal = ((rpm_ratio >= 0.6) & (rpm_ratio < 0.8)) | ((rpm_ratio > 1.2) & (rpm_ratio <= 1.5))
+    rpm_factor = np.where(optimal, 1.0, np.where(suboptimal, 1.1, 1.25))
+    cutting_time = length_to_drill / feed_rate * material_factor * size_factor * rpm_factor
+
+    # Setup time
+    setup_time = default_setup_time * np.where(drill_size > 20, 1.5, np.where(drill_size > 10, 1.2, 1.0))
+    setup_time = setup_time * np.where(hard_material, 1.3, 1.0)
+    setup_time = setup_time * (1 + length_ratio * 0.1)
+
+    # Grinding time per operation
+    grinding_time = default_grinding_time * np.where(drill_size > 15, 1.4, np.where(drill_size > 8, 1.2, 1.0))
+    grinding_time = (grinding_time * (1 + length_ratio * 0.05)) / grinding_frequency
+
+    # Inspection time
+    inspection_time = default_inspection_time * np.where(wall_thickness_inspection, 1.8, 1.0)
+    inspection_time = inspection_time * features
+    inspection_time = inspection_time * (1 + length_ratio * 0.08)
+
+    if not exact:
+        cutting_time = round_half_even_like_python(cutting_time)
+        setup_time = round_half_even_like_python(setup_time)
+        grinding_time = round_half_even_like_python(grinding_time)
+        inspection_time = round_half_even_like_python(inspection_time)
+
+    # Custom overrides are used as given (NaN means not provided)
+    setup_time = np.where(np.isnan(custom_setup_time), setup_time, custom_setup_time)
+    grinding_time = np.where(np.isnan(custom_grinding_time), grinding_time, custom_grinding_time)
+
+    if exact:
+        return _fixed_point_rollup(
+            cutting_time, setup_time, grinding_time, inspection_time,
+            features, tool_wear_consideration, tool_wear_factor
+        )
+
+    per_feature_time = cutting_time + grinding_time + (inspection_time / features)
+    per_feature_time = np.where(tool_wear_consideration, per_feature_time * (1 + tool_wear_factor), per_feature_time)
+    total_cutting_time = per_feature_time * features
+    total_time = total_cutting_time + setup_time + inspection_time
+    wear_time = np.where(tool_wear_consideration, per_feature_time * tool_wear_factor * features, 0.0)
+
+    return {
+        'cutting_time_per_feature': round_half_even_like_python(cutting_time),
+        'total_cutting_time': round_half_even_like_python(total_cutting_time),
+        'setup_time': round_half_even_like_python(setup_time),
+        'grinding_time_per_feature': round_half_even_like_python(grinding_time),
+        'total_grinding_time': round_half_even_like_python(grinding_time * features),
+        'inspection_time': round_half_even_like_python(inspection_time),
+        'tool_wear_factor_applied': tool_wear_consideration,
+        'tool_wear_additional_time': round_half_even_like_python(wear_time),
+        'total_standard_time': round_half_even_like_python(total_time),
+        'number_of_features': features,
+    }
+
+
+def _rollup_units(cutting_units: np.ndarray,
+                  setup_units: np.ndarray,
+                  grinding_units: np.ndarray,
+                  inspection_units: np.ndarray,
+                  features: np.ndarray,
+                  tool_wear_consideration: np.ndarray,
+                  wear_ppm: np.ndarray) -> Dict[str, np.ndarray]:
+    """Integer roll-up of the fixed-point components (int64 or Python int object arrays)."""
+    base_units = (cutting_units + grinding_units) * features + inspection_units
+    total_cutting_units = np.where(
+        tool_wear_consideration,
+        fixed_point_div_round_array(base_units * (FIXED_POINT_FACTOR_SCALE + wear_ppm), FIXED_POINT_FACTOR_SCALE),
+        base_units
+    )
+    wear_units = np.where(
+        tool_wear_consideration,
+        fixed_point_div_round_array(total_cutting_units * wear_ppm, FIXED_POINT_FACTOR_SCALE),
+        0
+    )
+    return {
+        'cutting_time_per_feature': cutting_units,
+        'total_cutting_time': total_cutting_units,
+        'setup_time': setup_units,
+        'grinding_time_per_feature': grinding_units,
+        'total_grinding_time': grinding_units * features,
+        'inspection_time': inspection_units,
+        'tool_wear_additional_time': wear_units,
+        'total_standard_time': total_cutting_units + setup_units + inspection_units,
+    }
+
+
+def _fixed_point_rollup(cutting_time: np.ndarray,
+                        setup_time: np.ndarray,
+                        grinding_time: np.ndarray,
+                        inspection_time: np.ndarray,
+                        features: np.ndarray,
+                        tool_wear_consideration: np.ndarray,
+                        tool_wear_factor: Any) -> Dict[str, np.ndarray]:
+    """
+    Vectorized GunDrillTimeCalculator._calculate_exact_standard_time roll-up.
+
+    Rows whose intermediates could leave the int64 range (very low feed
+    rates with long lengths and many features) are rolled up with Python
+    ints like the scalar method instead of wrapping around.
+    """
+    times = (cutting_time, setup_time, grinding_time, inspection_time)
+    wear_ppm = np.broadcast_to(
+        np.rint(np.asarray(tool_wear_factor) * FIXED_POINT_FACTOR_SCALE).astype(np.int64), features.shape
+    )
+
+    # Floating point bound on the largest intermediate, the wear multiplication
+    wear_scale = (FIXED_POINT_FACTOR_SCALE + np.abs(wear_ppm)) * np.maximum(1.0, np.abs(wear_ppm) / FIXED_POINT_FACTOR_SCALE)
+    peak = ((np.abs(cutting_time) + np.abs(grinding_time)) * features + np.abs(setup_time) + np.abs(inspection_time)) \
+        * FIXED_POINT_UNITS_PER_MINUTE * wear_scale
+    wide = ~(peak < INT64_SAFE_LIMIT)
+
+    units = _rollup_units(
+        *[to_fixed_point_array(np.where(wide, 0.0, minutes)) for minutes in times],
+        features, tool_wear_consideration, wear_ppm
+    )
+    results = {field: from_fixed_point_array(values) for field, values in units.items()}
+    total_units = units['total_standard_time']
+
+    if wide.any():
+        rows = np.flatnonzero(wide)
+        wide_units = _rollup_units(
+            *[np.array([to_fixed_point(float(minutes[row])) for row in rows], dtype=object) for minutes in times],
+            features[rows].astype(object), tool_wear_consideration[rows], wear_ppm[rows].astype(object)
+        )
+        for field, values in wide_units.items():
+            results[field][rows] = [from_fixed_point(value) for value in values]
+        if any(abs(value) > INT64_MAX for value in wide_units['total_standard_time']):
+            total_units = total_units.astype(object)
+        total_units[rows] = wide_units['total_standard_time']
+
+    return {
+        'cutting_time_per_feature': results['cutting_time_per_feature'],
+        'total_cutting_time': results['total_cutting_time'],
+        'setup_time': results['setup_time'],
+        'grinding_time_per_feature': results['grinding_time_per_feature'],
+        'total_grinding_time': results['total_grinding_time'],
+        'inspection_time': results['inspection_time'],
+        'tool_wear_factor_applied': tool_wear_consideration,
+        'tool_wear_additional_time': results['tool_wear_additional_time'],
+        'total_standard_time': results['total_standard_time'],
+        'number_of_features': features,
+        'total_standard_time_units': total_units,
+    }
+
+
+class BatchTimeCalculator:
+    """
+    Vectorized front end to a GunDrillTimeCalculator.
+
+    The calculator's parameters and material factors are read when the batch
+    calculator is created; call compile() again after changing them.
+    """
+
+    def __init__(self, calculator: Optional[GunDrillTimeCalculator] = None):
+        """Initialize the batch calculator from a scalar calculator."""
+        self.calculator = calculator if calculator is not None else GunDrillTimeCalculator()
+        self.compile()
+
+    def compile(self):
+        """Precompute the material lookup tables from the calculator."""
+        self.material_names, self.material_factor_table, self.hard_material_table = \
+            build_material_table(self.calculator.material_factors)
+
+    def encode_materials(self, material_grade: Any) -> np.ndarray:
+        """Map material grades to codes into this calculator's tables."""
+        return encode_materials(material_grade, self.material_names)
+
+    def calculate_batch(self,
+                        drill_size: Any,
+                        length_to_drill: Any,
+                        rpm: Any,
+                        feed_rate: Any,
+                        material_grade: Any = None,
+                        number_of_features: Any = 1,
+                        tool_wear_consideration: Any = True,
+                        wall_thickness_inspection: Any = False,
+                        custom_setup_time: Optional[Any] = None,
+                        custom_grinding_time: Optional[Any] = None,
+                        grinding_frequency: Any = 10,
+                        exact: bool = False,
+                        material_code: Optional[Any] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate the total standard time for a batch of gun drilling operations.
+
+        Args:
+            drill_size: Diameters of the drill bits (mm)
+            length_to_drill: Total lengths to be drilled (mm)
+            rpm: Revolutions per minute
+            feed_rate: Feed rates (mm/min)
+            material_grade: Material types
+            number_of_features: Numbers of drilling features
+            tool_wear_consideration: Whether to include tool wear factor
+            wall_thickness_inspection: Whether wall thickness inspection is required
+            custom_setup_time: Setup time overrides (NaN where not overridden)
+            custom_grinding_time: Grinding time overrides (NaN where not overridden)
+            grinding_frequency: Numbers of holes before grinding
+            exact: Use integer fixed-point arithmetic and round only the outputs
+            material_code: Pre-encoded materials, used instead of material_grade
+
+        Returns:
+            Dictionary of result arrays keyed like calculate_total_standard_time
+        """
+        drill_size = np.asarray(drill_size, dtype=np.float64)
+        length_to_drill = np.asarray(length_to_drill, dtype=np.float64)
+        rpm = np.asarray(rpm, dtype=np.float64)
+        feed_rate = np.asarray(feed_rate, dtype=np.float64)
+        size = np.broadcast(drill_size, length_to_drill, rpm, feed_rate).size
+
+        if material_code is None:
+            material_code = self.encode_materials(material_grade)
+        material_code = np.broadcast_to(np.asarray(material_code, dtype=np.intp), (size,))
+
+        calc = self.calculator
+        return compute_standard_times(
+            drill_size, length_to_drill, rpm, feed_rate,
+            self.material_factor_table[material_code],
+            self.hard_material_table[material_code],
+            np.broadcast_to(np.asarray(number_of_features, dtype=np.int64), (size,)),
+            np.broadcast_to(np.asarray(tool_wear_consideration, dtype=bool), (size,)),
+            np.asarray(wall_thickness_inspection, dtype=bool),
+            optional_column(custom_setup_time, size),
+            optional_column(custom_grinding_time, size),
+            np.asarray(grinding_frequency, dtype=np.int64),
+            calc.default_setup_time,
+            calc.default_grinding_time,
+            calc.default_inspection_time,
+            calc.tool_wear_factor,
+            exact=exact
+        )
+
+    def total_standard_time(self, exact: bool = True, **columns: Any) -> float:
+        """
+        Roll up the total standard time of a whole batch.
+
+        In exact mode the per-row totals are summed as integers, so the result
+        is identical regardless of batch order or how the batch is split.
+
+        Args:
+            exact: Use the fixed-point mode (recommended for roll-ups)
+            **columns: Keyword arguments accepted by calculate_batch
+
+        Returns:
+            Total standard time in minutes, rounded to two decimals
+        """
+        result = self.calculate_batch(exact=exact, **columns)
+        if exact:
+            total_units = sum_units(result['total_standard_time_units'])
+            step = FIXED_POINT_UNITS_PER_MINUTE // OUTPUT_UNITS_PER_MINUTE
+            return ((total_units + step // 2) // step) / OUTPUT_UNITS_PER_MINUTE
+        return round(float(np.sum(result['total_standard_time'])), 2)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    calculator = GunDrillTimeCalculator()
+    batch_calculator = BatchTimeCalculator(calculator)
+
+    rng = np.random.default_rng(0)
+    size = 100_000
+    columns = {
+        'drill_size': rng.uniform(1, 50, size),
+        'length_to_drill': rng.uniform(1, 1000, size),
+        'rpm': rng.uniform(100, 10000, size),
+        'feed_rate': rng.uniform(1, 1000, size),
+        'material_grade': rng.choice(['Steel', 'Aluminum', 'Titanium', 'Brass', 'Inconel'], size),
+        'number_of_features': rng.integers(1, 101, size),
+    }
+
+    print("Batch Calculation Totals:")
+    print("=" * 40)
+    print(f"Rounded mode: {batch_calculator.total_standard_time(exact=False, **columns)}")
+    print(f"Exact mode: {batch_calculator.total_standard_time(exact=True, **columns)}")
+
+    reversed_columns = {key: value[::-1] for key, value in columns.items()}
+    print(f"Exact mode (reversed order): {batch_calculator.total_standard_time(exact=True, **reversed_columns)}")
@@ -4,9 +4,72 @@ This module contains the core calculation formulas and business logic
 that will be translated into Power Apps expressions.
 """
 
+import copy
 import math
 from typing import Dict, Any, Optional, Tuple
 
+# Fixed-point resolution used by the exact calculation mode (micro-minutes).
+# All intermediate values are held as integers in these units and only
+# rounded to the 0.01 minute output resolution at the very end.
+FIXED_POINT_UNITS_PER_MINUTE = 1_000_000
+OUTPUT_UNITS_PER_MINUTE = 100
+# Multiplicative factors (e.g. tool wear) are scaled to parts per million.
+FIXED_POINT_FACTOR_SCALE = 1_000_000
+
+# Materials that need a more careful setup
+HARD_MATERIALS = ("steel", "stainless steel", "titanium")
+
+# Calculator attributes that profiles and scenarios may override
+OVERRIDABLE_PARAMETERS = (
+    'default_setup_time',
+    'default_grinding_time',
+    'default_inspection_time',
+    'tool_wear_factor',
+    'material_factors',
+)
+
+
+def to_fixed_point(minutes: float) -> int:
+    """
+    Convert a time in minutes to integer fixed-point units.
+    
+    Args:
+        minutes: Time in minutes
+        
+    Returns:
+        Time in FIXED_POINT_UNITS_PER_MINUTE units (round half to even)
+    """
+    return int(round(minutes * FIXED_POINT_UNITS_PER_MINUTE))
+
+
+def fixed_point_div_round(numerator: int, denominator: int) -> int:
+    """
+    Integer division rounding half up, used for all fixed-point rescaling.
+    
+    Args:
+        numerator: Non-negative integer dividend
+        denominator: Positive integer divisor
+        
+    Returns:
+        Rounded integer quotient
+    """
+    return (numerator + denominator // 2) // denominator
+
+
+def from_fixed_point(units: int) -> float:
+    """
+    Convert fixed-point units to minutes rounded to the output resolution.
+    
+    Args:
+        units: Time in FIXED_POINT_UNITS_PER_MINUTE units
+        
+    Returns:
+        Time in minutes with two decimal places
+    """
+    step = FIXED_POINT_UNITS_PER_MINUTE // OUTPUT_UNITS_PER_MINUTE
+    return fixed_point_div_round(units, step) / OUTPUT_UNITS_PER_MINUTE
+
+
 class GunDrillTimeCalculator:
     """
     Core calculator class for gun drill machine standard time calculations.
@@ -19,13 +82,23 @@ class GunDrillTimeCalculator:
         self.default_grinding_time = 2.5  # minutes
         self.default_inspection_time = 1.0  # minutes
         self.tool_wear_factor = 0.02  # 2% additional time for tool wear
+        self.material_factors = {
+            'aluminum': 0.8,
+            'steel': 1.0,
+            'stainless steel': 1.5,  # Increased for harder material
+            'cast iron': 1.1,
+            'titanium': 1.8,  # Increased for harder material
+            'brass': 0.9,
+            'copper': 0.85
+        }
 
     def calculate_cutting_time(self, 
                              drill_size: float, 
                              length_to_drill: float, 
                              rpm: float, 
                              feed_rate: float,
-                             material_grade: str) -> float:
+                             material_grade: str,
+                             round_result: bool = True) -> float:
         """
         Calculate the base cutting time for drilling operation.
         
@@ -35,6 +108,7 @@ class GunDrillTimeCalculator:
             rpm: Revolutions per minute
             feed_rate: Feed rate (mm/min)
             material_grade: Material type (Steel, Aluminum, Cast Iron, etc.)
+            round_result: Round to 2 decimals (disable for exact mode)
             
         Returns:
             Base cutting time in minutes
@@ -53,13 +127,14 @@ class GunDrillTimeCalculator:
         
         cutting_time = basic_cutting_time * material_factor * size_factor * rpm_factor
         
-        return round(cutting_time, 2)
+        return round(cutting_time, 2) if round_result else cutting_time
     
     def calculate_setup_time(self, 
                            drill_size: float, 
                            material_grade: str,
                            length_to_drill: float,
-                           custom_setup_time: Optional[float] = None) -> float:
+                           custom_setup_time: Optional[float] = None,
+                           round_result: bool = True) -> float:
         """
         Calculate setup time based on drill size, material, and length.
         
@@ -68,6 +143,7 @@ class GunDrillTimeCalculator:
             material_grade: Material type
             length_to_drill: Total length to be drilled (mm)
             custom_setup_time: Override default setup time if provided
+            round_result: Round to 2 decimals (disable for exact mode)
             
         Returns:
             Setup time in minutes
@@ -85,20 +161,21 @@ class GunDrillTimeCalculator:
             setup_time *= 1.2
             
         # Harder materials require more careful setup
-        if material_grade.lower() in ["steel", "stainless steel", "titanium"]:
+        if material_grade.lower() in HARD_MATERIALS:
             setup_time *= 1.3
             
         # Length effect on setup time (e.g., longer parts might need more complex fixturing)
         # This is a simplified linear scaling. Adjust as needed.
         setup_time *= (1 + (length_to_drill / 1000) * 0.1) # 10% increase per meter of length
             
-        return round(setup_time, 2)
+        return round(setup_time, 2) if round_result else setup_time
     
     def calculate_grinding_time(self, 
                               drill_size: float,
                               length_to_drill: float,
                               grinding_frequency: int = 10,
-                              custom_grinding_time: Optional[float] = None) -> float:
+                              custom_grinding_time: Optional[float] = None,
+                              round_result: bool = True) -> float:
         """
         Calculate grinding time based on drill size, length, and grinding frequency.
         
@@ -107,6 +184,7 @@ class GunDrillTimeCalculator:
             length_to_drill: Total length to be drilled (mm)
             grinding_frequency: Number of holes before grinding (default: 10)
             custom_grinding_time: Override default grinding time if provided
+            round_result: Round to 2 decimals (disable for exact mode)
             
         Returns:
             Grinding time per operation in minutes
@@ -128,11 +206,12 @@ class GunDrillTimeCalculator:
         # This is a simplified linear scaling. Adjust as needed.
         grinding_time_per_operation = (grinding_time * (1 + (length_to_drill / 1000) * 0.05)) / grinding_frequency # 5% increase per meter of length
         
-        return round(grinding_time_per_operation, 2)    
+        return round(grinding_time_per_operation, 2) if round_result else grinding_time_per_operation
     def calculate_inspection_time(self, 
                                 length_to_drill: float,
                                 wall_thickness_inspection: bool = False,
-                                number_of_features: int = 1) -> float:
+                                number_of_features: int = 1,
+                                round_result: bool = True) -> float:
         """
         Calculate inspection time based on inspection requirements and length.
         
@@ -140,6 +219,7 @@ class GunDrillTimeCalculator:
             length_to_drill: Total length to be drilled (mm)
             wall_thickness_inspection: Whether wall thickness inspection is required
             number_of_features: Number of features to inspect
+            round_result: Round to 2 decimals (disable for exact mode)
             
         Returns:
             Inspection time in minutes
@@ -156,7 +236,7 @@ class GunDrillTimeCalculator:
         # Length effect on inspection time (e.g., longer parts might take longer to inspect)
         total_inspection_time *= (1 + (length_to_drill / 1000) * 0.08) # 8% increase per meter of length
         
-        return round(total_inspection_time, 2)    
+        return round(total_inspection_time, 2) if round_result else total_inspection_time
     def calculate_total_standard_time(self, 
                                     drill_size: float,
                                     length_to_drill: float,
@@ -168,7 +248,8 @@ class GunDrillTimeCalculator:
                                     wall_thickness_inspection: bool = False,
                                     custom_setup_time: Optional[float] = None,
                                     custom_grinding_time: Optional[float] = None,
-                                    grinding_frequency: int = 10) -> Dict[str, float]:
+                                    grinding_frequency: int = 10,
+                                    exact: bool = False) -> Dict[str, float]:
         """
         Calculate the total standard time for gun drilling operation.
         
@@ -184,10 +265,18 @@ class GunDrillTimeCalculator:
             custom_setup_time: Override default setup time
             custom_grinding_time: Override default grinding time
             grinding_frequency: Number of holes before grinding
+            exact: Use integer fixed-point arithmetic and round only the outputs
             
         Returns:
             Dictionary containing detailed time breakdown
         """
+        if exact:
+            return self._calculate_exact_standard_time(
+                drill_size, length_to_drill, rpm, feed_rate, material_grade,
+                number_of_features, tool_wear_consideration, wall_thickness_inspection,
+                custom_setup_time, custom_grinding_time, grinding_frequency
+            )
+        
         # Calculate individual time components
         cutting_time = self.calculate_cutting_time(
             drill_size, length_to_drill, rpm, feed_rate, material_grade
@@ -230,6 +319,71 @@ class GunDrillTimeCalculator:
             'number_of_features': number_of_features
         }
     
+    def _calculate_exact_standard_time(self,
+                                       drill_size: float,
+                                       length_to_drill: float,
+                                       rpm: float,
+                                       feed_rate: float,
+                                       material_grade: str,
+                                       number_of_features: int,
+                                       tool_wear_consideration: bool,
+                                       wall_thickness_inspection: bool,
+                                       custom_setup_time: Optional[float],
+                                       custom_grinding_time: Optional[float],
+                                       grinding_frequency: int) -> Dict[str, Any]:
+        """
+        Calculate the total standard time in integer fixed-point units.
+        
+        Each time component is converted to FIXED_POINT_UNITS_PER_MINUTE once,
+        without intermediate rounding, and every roll-up is done with integer
+        arithmetic so totals do not depend on evaluation order.
+        
+        Returns:
+            Dictionary containing detailed time breakdown, plus the
+            'total_standard_time_units' integer for exact aggregation
+        """
+        cutting_units = to_fixed_point(self.calculate_cutting_time(
+            drill_size, length_to_drill, rpm, feed_rate, material_grade, round_result=False
+        ))
+        setup_units = to_fixed_point(self.calculate_setup_time(
+            drill_size, material_grade, length_to_drill, custom_setup_time, round_result=False
+        ))
+        grinding_units = to_fixed_point(self.calculate_grinding_time(
+            drill_size, length_to_drill, grinding_frequency, custom_grinding_time, round_result=False
+        ))
+        inspection_units = to_fixed_point(self.calculate_inspection_time(
+            length_to_drill, wall_thickness_inspection, number_of_features, round_result=False
+        ))
+        
+        # Per-feature time times the number of features, without dividing inspection
+        base_units = (cutting_units + grinding_units) * number_of_features + inspection_units
+        
+        if tool_wear_consideration:
+            wear_ppm = int(round(self.tool_wear_factor * FIXED_POINT_FACTOR_SCALE))
+            total_cutting_units = fixed_point_div_round(
+                base_units * (FIXED_POINT_FACTOR_SCALE + wear_ppm), FIXED_POINT_FACTOR_SCALE
+            )
+            wear_units = fixed_point_div_round(total_cutting_units * wear_ppm, FIXED_POINT_FACTOR_SCALE)
+        else:
+            total_cutting_units = base_units
+            wear_units = 0
+        
+        total_units = total_cutting_units + setup_units + inspection_units
+        
+        return {
+            'cutting_time_per_feature': from_fixed_point(cutting_units),
+            'total_cutting_time': from_fixed_point(total_cutting_units),
+            'setup_time': from_fixed_point(setup_units),
+            'grinding_time_per_feature': from_fixed_point(grinding_units),
+            'total_grinding_time': from_fixed_point(grinding_units * number_of_features),
+            'inspection_time': from_fixed_point(inspection_units),
+            'tool_wear_factor_applied': tool_wear_consideration,
+            'tool_wear_additional_time': from_fixed_point(wear_units),
+            'total_standard_time': from_fixed_point(total_units),
+            'number_of_features': number_of_features,
+            'total_standard_time_units': total_units
+        }
+    
     def _get_material_factor(self, material_grade: str) -> float:
         """
         Get material-specific factor for cutting time calculation.
@@ -240,17 +394,7 @@ class GunDrillTimeCalculator:
         Returns:
             Material factor (multiplier)
         """
-        material_factors = {
-            'aluminum': 0.8,
-            'steel': 1.0,
-            'stainless steel': 1.5,  # Increased for harder material
-            'cast iron': 1.1,
-            'titanium': 1.8,  # Increased for harder material
-            'brass': 0.9,
-            'copper': 0.85
-        }
-        
-        return material_factors.get(material_grade.lower(), 1.0)
+        return self.material_factors.get(material_grade.lower(), 1.0)
     
     def _get_drill_size_factor(self, drill_size: float) -> float:
         """
@@ -348,6 +492,33 @@ class GunDrillTimeCalculator:
             return False, "; ".join(errors)
         
         return True, ""
+    
+    def with_overrides(self, overrides: Dict[str, Any]) -> 'GunDrillTimeCalculator':
+        """
+        Create a copy of the calculator with parameter overrides applied.
+        
+        material_factors overrides are merged into the current factors, so
+        only the materials being changed need to be listed.
+        
+        Args:
+            overrides: Attribute name (from OVERRIDABLE_PARAMETERS) to new value
+            
+        Returns:
+            New calculator instance (this one is left unchanged)
+        """
+        unknown = [key for key in overrides if key not in OVERRIDABLE_PARAMETERS]
+        if unknown:
+            raise ValueError(f"Unknown calculator parameters: {', '.join(unknown)}")
+        
+        calculator = copy.deepcopy(self)
+        for key, value in overrides.items():
+            if key == 'material_factors':
+                calculator.material_factors.update(
+                    {material.lower(): factor for material, factor in value.items()}
+                )
+            else:
+                setattr(calculator, key, value)
+        return calculator
 
 
 # Power Apps Formula Translations
@@ -0,0 +1,274 @@
+"""
+Gun Drill Machine Standard Time Calculator - Calculator Profile Registry
+This module keeps named calculator profiles (per plant or machine cell
+default times and material factors) loaded from a JSON config. Each
+profile's lookup tables are precompiled once, mixed-profile batches are
+evaluated in a single vectorized pass, and reloading swaps in a new
+immutable snapshot so in-flight calculations are never blocked.
+
+Config format:
+    {
+        "profiles": {
+            "plant_a": {"default_setup_time": 6.0},
+            "cell_7": {"tool_wear_factor": 0.03,
+                       "material_factors": {"titanium": 2.0}}
+        }
+    }
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from calculation_formulas import GunDrillTimeCalculator, HARD_MATERIALS
+from batch_calculation import compute_standard_times, encode_materials, optional_column
+
+
+class CalculatorProfile:
+    """
+    A named calculator configuration.
+    """
+
+    def __init__(self, name: str, overrides: Dict[str, Any]):
+        """
+        Initialize the profile.
+
+        Args:
+            name: Profile name
+            overrides: Calculator parameters that differ from the defaults
+        """
+        self.name = name
+        self.overrides = overrides
+        self.calculator = GunDrillTimeCalculator().with_overrides(overrides)
+
+
+class _RegistrySnapshot:
+    """
+    Immutable set of profiles with tables stacked for mixed-profile batches.
+
+    Row r of each table belongs to profile names[r]; material columns follow
+    material_names with a final column for unknown materials.
+    """
+
+    def __init__(self, profiles: Dict[str, CalculatorProfile]):
+        """Precompile the stacked lookup tables for a set of profiles."""
+        self.profiles = profiles
+        self.names = tuple(profiles)
+        self.index = {name: row for row, name in enumerate(self.names)}
+
+        material_names = []
+        for profile in profiles.values():
+            material_names.extend(
+                material for material in profile.calculator.material_factors if material not in material_names
+            )
+        self.material_names = tuple(material_names)
+        self.material_factor_table = np.array([
+            [profile.calculator.material_factors.get(material, 1.0) for material in self.material_names] + [1.0]
+            for profile in profiles.values()
+        ], dtype=np.float64).reshape(len(self.names), len(self.material_names) + 1)
+        self.hard_material_table = np.array(
+            [material in HARD_MATERIALS for material in self.material_names] + [False], dtype=bool
+        )
+
+        def parameter(attribute):
+            return np.array([getattr(profile.calculator, attribute) for profile in profiles.values()],
+                            dtype=np.float64)
+
+        self.default_setup_time = parameter('default_setup_time')
+        self.default_grinding_time = parameter('default_grinding_time')
+        self.default_inspection_time = parameter('default_inspection_time')
+        self.tool_wear_factor = parameter('tool_wear_factor')
+
+
+class ProfileRegistry:
+    """
+    Registry of named calculator profiles.
+
+    Readers take the current snapshot once per call and never lock; writers
+    build a complete new snapshot and publish it with a single assignment.
+    """
+
+    def __init__(self, config_path: Optional[str] = None):
+        """
+        Initialize the registry, loading profiles from a config file if given.
+
+        Args:
+            config_path: JSON profile config path
+        """
+        self.config_path = config_path
+        self._config_mtime = None
+        self._write_lock = threading.Lock()
+        self._snapshot = _RegistrySnapshot({})
+        if config_path is not None:
+            self.reload()
+
+    @property
+    def names(self):
+        """Names of the registered profiles."""
+        return self._snapshot.names
+
+    def get(self, name: str) -> CalculatorProfile:
+        """
+        Get a profile by name.
+
+        Raises:
+            KeyError: If the profile is not registered
+        """
+        profiles = self._snapshot.profiles
+        if name not in profiles:
+            raise KeyError(f"Unknown calculator profile: {name}")
+        return profiles[name]
+
+    def register(self, name: str, overrides: Dict[str, Any]):
+        """
+        Add or replace a single profile.
+
+        Args:
+            name: Profile name
+            overrides: Calculator parameters that differ from the defaults
+        """
+        profile = CalculatorProfile(name, overrides)
+        with self._write_lock:
+            profiles = dict(self._snapshot.profiles)
+            profiles[name] = profile
+            self._snapshot = _RegistrySnapshot(profiles)
+
+    def reload(self, config_path: Optional[str] = None):
+        """
+        Load all profiles from the JSON config, replacing the current set.
+
+        The new profiles are compiled before they are published, so calls
+        already running keep using the previous snapshot undisturbed.
+
+        Args:
+            config_path: Config path (defaults to the one given at creation)
+        """
+        config_path = config_path or self.config_path
+        if config_path is None:
+            raise ValueError("No profile config path configured")
+        mtime = os.path.getmtime(config_path)
+        with open(config_path, 'r', encoding='utf-8') as handle:
+            config = json.load(handle)
+        profiles = {
+            name: CalculatorProfile(name, overrides)
+            for name, overrides in config.get('profiles', {}).items()
+        }
+        snapshot = _RegistrySnapshot(profiles)
+        with self._write_lock:
+            self.config_path = config_path
+            self._config_mtime = mtime
+            self._snapshot = snapshot
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the config if its modification time changed.
+
+        Returns:
+            Whether the profiles were reloaded
+        """
+        if self.config_path is None or os.path.getmtime(self.config_path) == self._config_mtime:
+            return False
+        self.reload()
+        return True
+
+    def calculate_total_standard_time(self, profile: str, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Calculate a single case with the named profile.
+
+        Args:
+            profile: Profile name
+            **kwargs: Arguments for GunDrillTimeCalculator.calculate_total_standard_time
+
+        Returns:
+            Dictionary containing detailed time breakdown
+        """
+        return self.get(profile).calculator.calculate_total_standard_time(**kwargs)
+
+    def calculate_mixed_batch(self,
+                              profile: Any,
+                              drill_size: Any,
+                              length_to_drill: Any,
+                              rpm: Any,
+                              feed_rate: Any,
+                              material_grade: Any,
+                              number_of_features: Any = 1,
+                              tool_wear_consideration: Any = True,
+                              wall_thickness_inspection: Any = False,
+                              custom_setup_time: Optional[Any] = None,
+                              custom_grinding_time: Optional[Any] = None,
+                              grinding_frequency: Any = 10,
+                              exact: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Calculate a batch whose rows may each use a different profile.
+
+        Per-row parameters and material factors are gathered from the stacked
+        profile tables, and the whole batch is evaluated in one kernel call.
+
+        Args:
+            profile: Profile name per row (or one name for the whole batch)
+            drill_size .. grinding_frequency: As for BatchTimeCalculator.calculate_batch
+            exact: Use integer fixed-point arithmetic and round only the outputs
+
+        Returns:
+            Dictionary of result arrays keyed like calculate_total_standard_time
+
+        Raises:
+            KeyError: If a row names an unknown profile
+        """
+        snapshot = self._snapshot
+
+        drill_size = np.asarray(drill_size, dtype=np.float64)
+        length_to_drill = np.asarray(length_to_drill, dtype=np.float64)
+        rpm = np.asarray(rpm, dtype=np.float64)
+        feed_rate = np.asarray(feed_rate, dtype=np.float64)
+        size = np.broadcast(drill_size, length_to_drill, rpm, feed_rate).size
+
+        profile_names, profile_inverse = np.unique(np.asarray(profile, dtype=object).ravel(), return_inverse=True)
+        unknown = [str(name) for name in profile_names if name not in snapshot.index]
+        if unknown:
+            raise KeyError(f"Unknown calculator profile: {', '.join(unknown)}")
+        profile_rows = np.array([snapshot.index[name] for name in profile_names], dtype=np.intp)[profile_inverse]
+        profile_rows = np.broadcast_to(profile_rows, (size,))
+        material_code = np.broadcast_to(encode_materials(material_grade, snapshot.material_names), (size,))
+
+        return compute_standard_times(
+            drill_size, length_to_drill, rpm, feed_rate,
+            snapshot.material_factor_table[profile_rows, material_code],
+            snapshot.hard_material_table[material_code],
+            np.broadcast_to(np.asarray(number_of_features, dtype=np.int64), (size,)),
+            np.broadcast_to(np.asarray(tool_wear_consideration, dtype=bool), (size,)),
+            np.asarray(wall_thickness_inspection, dtype=bool),
+            optional_column(custom_setup_time, size),
+            optional_column(custom_grinding_time, size),
+            np.asarray(grinding_frequency, dtype=np.int64),
+            snapshot.default_setup_time[profile_rows],
+            snapshot.default_grinding_time[profile_rows],
+            snapshot.default_inspection_time[profile_rows],
+            snapshot.tool_wear_factor[profile_rows],
+            exact=exact
+        )
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    registry = ProfileRegistry()
+    registry.register('default', {})
+    registry.register('plant_a', {'default_setup_time': 6.0, 'default_inspection_time': 1.2})
+    registry.register('cell_7', {'tool_wear_factor': 0.03, 'material_factors': {'Titanium': 2.0}})
+
+    case = {
+        'drill_size': 10.0, 'length_to_drill': 100.0, 'rpm': 1800, 'feed_rate': 80.0,
+        'material_grade': 'Titanium', 'number_of_features': 2,
+    }
+    batch = registry.calculate_mixed_batch(
+        profile=['default', 'plant_a', 'cell_7'], **{key: [value] * 3 for key, value in case.items()}
+    )
+
+    print("Mixed-Profile Batch Results:")
+    print("=" * 40)
+    for row, name in enumerate(registry.names):
+        scalar = registry.calculate_total_standard_time(name, **case)['total_standard_time']
+        print(f"{name}: batch {batch['total_standard_time'][row]}, scalar {scalar}")
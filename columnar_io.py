@@ -0,0 +1,277 @@
+"""
+Gun Drill Machine Standard Time Calculator - Columnar Input and Output
+This module reads calculator inputs from Parquet or Arrow IPC files and
+writes the calculated results back in the same columnar formats. Files are
+processed one record batch (Parquet row group) at a time, so inputs larger
+than memory can be re-costed with bounded memory use.
+"""
+
+import os
+from typing import Dict, Any, Iterator, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from calculation_formulas import GunDrillTimeCalculator
+from batch_calculation import BatchTimeCalculator, RESULT_FIELDS
+
+# Input columns and the defaults used when a column is absent
+INPUT_COLUMNS = {
+    'drill_size': None,
+    'length_to_drill': None,
+    'rpm': None,
+    'feed_rate': None,
+    'material_grade': None,
+    'number_of_features': 1,
+    'tool_wear_consideration': True,
+    'wall_thickness_inspection': False,
+    'custom_setup_time': None,
+    'custom_grinding_time': None,
+    'grinding_frequency': 10,
+}
+REQUIRED_COLUMNS = ('drill_size', 'length_to_drill', 'rpm', 'feed_rate', 'material_grade')
+
+# Result columns written to the output; stale copies in the input are replaced
+OUTPUT_COLUMNS = tuple(
+    field for field in RESULT_FIELDS + ('total_standard_time_units',) if field not in INPUT_COLUMNS
+)
+
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+
+DEFAULT_BATCH_SIZE = 65536
+
+
+def _is_arrow_ipc(path: str) -> bool:
+    """Whether a path should be treated as an Arrow IPC file rather than Parquet."""
+    return os.path.splitext(path)[1].lower() in ARROW_EXTENSIONS
+
+
+def iter_record_batches(path: str,
+                        batch_size: int = DEFAULT_BATCH_SIZE,
+                        columns: Optional[Sequence[str]] = None) -> Iterator[pa.RecordBatch]:
+    """
+    Stream record batches from a Parquet or Arrow IPC file.
+
+    Parquet files are read row group by row group; Arrow IPC files are
+    memory-mapped so their buffers are used without copying.
+
+    Args:
+        path: Input file path
+        batch_size: Maximum rows per Parquet batch
+        columns: Columns to read (all columns if None)
+
+    Yields:
+        pyarrow RecordBatch objects
+    """
+    if _is_arrow_ipc(path):
+        with pa.memory_map(path, 'r') as source:
+            reader = pa.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                yield batch.select(columns) if columns is not None else batch
+    else:
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            columns = [name for name in columns if name in parquet_file.schema_arrow.names]
+        yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+
+
+def _numeric_column(array: pa.Array, dtype: Any, fill_value: Any = None) -> np.ndarray:
+    """
+    Convert an Arrow column to numpy, without copying when possible.
+
+    Primitive columns without nulls and with a matching type are viewed
+    directly; otherwise the column is cast and nulls are filled first.
+    """
+    target = pa.from_numpy_dtype(np.dtype(dtype))
+    if array.null_count:
+        array = pc.fill_null(array, fill_value)
+    if array.type != target:
+        array = pc.cast(array, target)
+    return array.to_numpy(zero_copy_only=False)
+
+
+def record_batch_to_columns(batch: pa.RecordBatch,
+                            batch_calculator: BatchTimeCalculator) -> Dict[str, Any]:
+    """
+    Convert an input record batch to calculate_batch keyword arguments.
+
+    Materials are dictionary-encoded so each distinct grade is looked up once
+    per batch, and missing optional columns fall back to their defaults.
+
+    Args:
+        batch: Record batch with INPUT_COLUMNS columns
+        batch_calculator: Calculator whose material table is used
+
+    Returns:
+        Dictionary of numpy columns for BatchTimeCalculator.calculate_batch
+
+    Raises:
+        ValueError: If a required column is missing or a required numeric
+            column contains nulls
+    """
+    names = batch.schema.names
+    missing = [name for name in REQUIRED_COLUMNS if name not in names]
+    if missing:
+        raise ValueError(f"Missing required input columns: {', '.join(missing)}")
+
+    columns = {}
+    for name in ('drill_size', 'length_to_drill', 'rpm', 'feed_rate'):
+        array = batch.column(name)
+        if array.null_count:
+            raise ValueError(f"Required input column {name} has {array.null_count} null values")
+        columns[name] = _numeric_column(array, np.float64)
+
+    materials = batch.column('material_grade')
+    if not pa.types.is_dictionary(materials.type):
+        materials = pc.dictionary_encode(materials)
+    dictionary_codes = batch_calculator.encode_materials(materials.dictionary.to_pylist())
+    # Null grades point past the dictionary, at the unknown-material code
+    dictionary_codes = np.append(np.asarray(dictionary_codes, dtype=np.intp), len(batch_calculator.material_names))
+    indices = _numeric_column(materials.indices, np.intp, len(materials.dictionary))
+    columns['material_code'] = dictionary_codes[indices]
+
+    for name, dtype in (('number_of_features', np.int64),
+                        ('tool_wear_consideration', np.bool_),
+                        ('wall_thickness_inspection', np.bool_),
+                        ('grinding_frequency', np.int64)):
+        default = INPUT_COLUMNS[name]
+        if name in names:
+            columns[name] = _numeric_column(batch.column(name), dtype, default)
+        else:
+            columns[name] = default
+
+    for name in ('custom_setup_time', 'custom_grinding_time'):
+        if name in names:
+            columns[name] = _numeric_column(batch.column(name), np.float64, np.nan)
+
+    return columns
+
+
+def results_to_record_batch(results: Dict[str, np.ndarray],
+                            passthrough: Optional[pa.RecordBatch] = None) -> pa.RecordBatch:
+    """
+    Build an output record batch from batch calculation results.
+
+    Args:
+        results: Result arrays from BatchTimeCalculator.calculate_batch
+        passthrough: Input record batch whose columns are copied to the output
+            (result columns from an earlier run are replaced, not kept)
+
+    Returns:
+        pyarrow RecordBatch with the input columns followed by the results
+    """
+    size = len(results['total_standard_time'])
+    arrays = []
+    names = []
+    if passthrough is not None:
+        for name, array in zip(passthrough.schema.names, passthrough.columns):
+            if name not in OUTPUT_COLUMNS:
+                arrays.append(array)
+                names.append(name)
+    for field in OUTPUT_COLUMNS:
+        if field in results:
+            arrays.append(pa.array(np.broadcast_to(results[field], (size,))))
+            names.append(field)
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def write_record_batches(path: str, batches: Iterator[pa.RecordBatch]) -> int:
+    """
+    Stream record batches to a Parquet or Arrow IPC file.
+
+    Each batch becomes one Parquet row group or one IPC record batch, so the
+    writer never holds more than a single batch in memory.
+
+    Args:
+        path: Output file path
+        batches: Record batches sharing one schema
+
+    Returns:
+        Number of rows written
+    """
+    writer = None
+    rows = 0
+    try:
+        for batch in batches:
+            if writer is None:
+                if _is_arrow_ipc(path):
+                    writer = pa.ipc.new_file(path, batch.schema)
+                else:
+                    writer = pq.ParquetWriter(path, batch.schema)
+            if _is_arrow_ipc(path):
+                writer.write_batch(batch)
+            else:
+                writer.write_batch(batch, row_group_size=batch.num_rows)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_inputs(path: str, columns: Dict[str, Any]) -> int:
+    """
+    Write calculator input columns (e.g. converted from CSV) to a columnar file.
+
+    Args:
+        path: Output file path
+        columns: Mapping of INPUT_COLUMNS names to sequences
+
+    Returns:
+        Number of rows written
+    """
+    table = pa.table({
+        name: pa.array(values).dictionary_encode() if name == 'material_grade' else pa.array(values)
+        for name, values in columns.items()
+    })
+    return write_record_batches(path, iter(table.to_batches(max_chunksize=DEFAULT_BATCH_SIZE)))
+
+
+def process_file(input_path: str,
+                 output_path: str,
+                 calculator: Optional[GunDrillTimeCalculator] = None,
+                 exact: bool = False,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 include_inputs: bool = True) -> int:
+    """
+    Calculate standard times for every row of a columnar input file.
+
+    Args:
+        input_path: Parquet or Arrow IPC file with INPUT_COLUMNS
+        output_path: Parquet or Arrow IPC file for the results
+        calculator: Calculator to use (default parameters if None)
+        exact: Use the fixed-point calculation mode
+        batch_size: Maximum rows per Parquet batch
+        include_inputs: Copy the input columns into the output
+
+    Returns:
+        Number of rows processed
+    """
+    batch_calculator = BatchTimeCalculator(calculator)
+
+    def result_batches():
+        for batch in iter_record_batches(input_path, batch_size):
+            results = batch_calculator.calculate_batch(
+                exact=exact, **record_batch_to_columns(batch, batch_calculator)
+            )
+            yield results_to_record_batch(results, batch if include_inputs else None)
+
+    return write_record_batches(output_path, result_batches())
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 3:
+        print("Usage: python columnar_io.py INPUT.parquet OUTPUT.parquet [--exact]")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    row_count = process_file(sys.argv[1], sys.argv[2], exact='--exact' in sys.argv[3:])
+    elapsed = time.perf_counter() - start
+    print(f"Processed {row_count} rows in {elapsed:.2f}s -> {sys.argv[2]}")
@@ -0,0 +1,314 @@
+"""
+Gun Drill Machine Standard Time Calculator - Equivalence Harness
+Differential test of the optimized calculation paths (vectorized batch,
+mixed-profile registry, columnar input, response-surface lookup, worker
+pool) against the reference GunDrillTimeCalculator.calculate_total_standard_time.
+Random valid inputs span the full validate_input_parameters ranges
+(log-uniform near zero), are concentrated around the band edges of the
+piecewise factors and include front-end preset rows on the response-surface
+grid. Every output field of each implementation is compared (including the
+fixed-point units in exact mode), and the throughput of each implementation
+is reported.
+
+Usage:
+    python equivalence_harness.py [--count N] [--chunk-size N] [--seed N] [--workers N]
+"""
+
+import argparse
+import math
+import sys
+import time
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from calculation_formulas import GunDrillTimeCalculator
+from batch_calculation import BatchTimeCalculator, RESULT_FIELDS
+from calculator_profiles import ProfileRegistry
+from columnar_io import record_batch_to_columns
+from response_surface import ResponseSurface, default_axes
+from worker_pool import WorkerPool
+
+# Band edges of the piecewise factors
+DRILL_SIZE_EDGES = (5.0, 8.0, 10.0, 15.0, 20.0)
+RPM_RATIO_EDGES = (0.6, 0.8, 1.2, 1.5)
+MATERIALS = ('Steel', 'steel', 'Stainless Steel', 'Titanium', 'Aluminum', 'Cast Iron',
+             'Brass', 'Copper', 'Inconel')
+
+# Limits from GunDrillTimeCalculator.validate_input_parameters
+MAX_DRILL_SIZE = 50.0
+MAX_LENGTH_TO_DRILL = 1000.0
+MAX_RPM = 10000.0
+MAX_FEED_RATE = 1000.0
+MAX_NUMBER_OF_FEATURES = 100
+
+# Smallest magnitude of the log-uniform samples near zero
+LOG_UNIFORM_MIN = 1e-6
+
+# Grinding frequency of preset rows, that of the default response surface
+PRESET_GRINDING_FREQUENCY = 10
+
+
+def _near_edges(rng: np.random.Generator, edges: Any, size: int) -> np.ndarray:
+    """Values on, one ulp either side of, or very close to the given edges."""
+    values = rng.choice(np.asarray(edges, dtype=np.float64), size)
+    kind = rng.integers(0, 4, size)
+    values = np.where(kind == 1, np.nextafter(values, np.inf), values)
+    values = np.where(kind == 2, np.nextafter(values, -np.inf), values)
+    return np.where(kind == 3, values * (1 + rng.uniform(-1e-6, 1e-6, size)), values)
+
+
+def _open_interval(rng: np.random.Generator, upper: float, size: int, log_fraction: float = 0.3) -> np.ndarray:
+    """
+    Values over the whole open interval (0, upper], with a share drawn
+    log-uniformly from LOG_UNIFORM_MIN so magnitudes near zero are covered.
+    """
+    uniform = rng.uniform(np.nextafter(0, 1), upper, size)
+    log_uniform = np.exp(rng.uniform(np.log(LOG_UNIFORM_MIN), np.log(upper), size))
+    return np.where(rng.random(size) < log_fraction, log_uniform, uniform)
+
+
+def generate_inputs(rng: np.random.Generator, size: int, edge_fraction: float = 0.5,
+                    preset_fraction: float = 0.1) -> Dict[str, np.ndarray]:
+    """
+    Generate random valid calculator inputs concentrated around band edges.
+
+    Drill sizes, lengths and feed rates span the full open intervals
+    accepted by validate_input_parameters, including values near zero.
+    A share of rows is drawn from the response-surface grid instead, so the
+    table lookups are exercised and not only the calculator fallback.
+
+    Args:
+        rng: Random generator
+        size: Number of rows
+        edge_fraction: Share of drill sizes and RPM ratios placed at band edges
+        preset_fraction: Share of rows drawn from the front-end preset grid
+
+    Returns:
+        Dictionary of input columns for BatchTimeCalculator.calculate_batch
+    """
+    at_edge = rng.random(size) < edge_fraction
+    drill_size = np.where(at_edge, _near_edges(rng, DRILL_SIZE_EDGES, size),
+                          _open_interval(rng, MAX_DRILL_SIZE, size))
+
+    optimal_rpm = (40 * 1000) / (math.pi * drill_size)
+    at_edge = rng.random(size) < edge_fraction
+    rpm_ratio = np.where(at_edge, _near_edges(rng, RPM_RATIO_EDGES, size), rng.uniform(0.3, 2.0, size))
+    rpm = rpm_ratio * optimal_rpm
+    out_of_range = rpm > MAX_RPM
+    rpm[out_of_range] = rng.uniform(1, MAX_RPM, int(out_of_range.sum()))
+
+    custom_setup_time = np.where(rng.random(size) < 0.2, np.round(rng.uniform(0.5, 30, size), 2), np.nan)
+    custom_grinding_time = np.where(rng.random(size) < 0.2, np.round(rng.uniform(0.1, 10, size), 3), np.nan)
+
+    columns = {
+        'drill_size': drill_size,
+        'length_to_drill': _open_interval(rng, MAX_LENGTH_TO_DRILL, size),
+        'rpm': rpm,
+        'feed_rate': _open_interval(rng, MAX_FEED_RATE, size),
+        'material_grade': np.asarray(MATERIALS, dtype=object)[rng.integers(0, len(MATERIALS), size)],
+        'number_of_features': rng.integers(1, MAX_NUMBER_OF_FEATURES + 1, size),
+        'tool_wear_consideration': rng.random(size) < 0.5,
+        'wall_thickness_inspection': rng.random(size) < 0.5,
+        'custom_setup_time': custom_setup_time,
+        'custom_grinding_time': custom_grinding_time,
+        'grinding_frequency': rng.integers(1, 21, size),
+    }
+
+    preset = rng.random(size) < preset_fraction
+    for name, values in default_axes().items():
+        values = np.asarray(values, dtype=columns[name].dtype)
+        columns[name][preset] = values[rng.integers(0, len(values), int(preset.sum()))]
+    columns['custom_setup_time'][preset] = np.nan
+    columns['custom_grinding_time'][preset] = np.nan
+    columns['grinding_frequency'][preset] = PRESET_GRINDING_FREQUENCY
+    return columns
+
+
+def output_fields(exact: bool) -> Tuple[str, ...]:
+    """Output fields compared against the reference."""
+    return RESULT_FIELDS + ('total_standard_time_units',) if exact else RESULT_FIELDS
+
+
+def _row_arguments(columns: Dict[str, np.ndarray]) -> Iterator[Dict[str, Any]]:
+    """Input columns as calculate_total_standard_time keyword arguments, row by row."""
+    names = list(columns)
+    for row in zip(*[columns[name].tolist() for name in names]):
+        arguments = dict(zip(names, row))
+        for name in ('custom_setup_time', 'custom_grinding_time'):
+            if math.isnan(arguments[name]):
+                arguments[name] = None
+        yield arguments
+
+
+def reference_results(calculator: GunDrillTimeCalculator, columns: Dict[str, np.ndarray], exact: bool) -> Dict[str, np.ndarray]:
+    """Run the scalar reference row by row and collect its outputs as columns."""
+    fields = output_fields(exact)
+    outputs = {field: [] for field in fields}
+    for arguments in _row_arguments(columns):
+        result = calculator.calculate_total_standard_time(exact=exact, **arguments)
+        for field in fields:
+            outputs[field].append(result[field])
+    return {field: np.asarray(values) for field, values in outputs.items()}
+
+
+def build_implementations(calculator: GunDrillTimeCalculator,
+                          exact: bool,
+                          pool: Optional[WorkerPool] = None) -> Dict[str, Tuple[Callable, Tuple[str, ...]]]:
+    """
+    Optimized implementations under test.
+
+    The response surface only provides the rounded total, so it is compared
+    on that field in rounded mode only.
+
+    Args:
+        calculator: Reference calculator the implementations are built from
+        exact: Whether the fixed-point mode is compared
+        pool: Worker pool to include (its workers use default parameters)
+
+    Returns:
+        Name to (function of the input columns, output fields to compare)
+    """
+    fields = output_fields(exact)
+    batch_calculator = BatchTimeCalculator(calculator)
+    registry = ProfileRegistry()
+    registry.register('reference', {})
+
+    def batch(columns):
+        return batch_calculator.calculate_batch(exact=exact, **columns)
+
+    def profile(columns):
+        return registry.calculate_mixed_batch('reference', exact=exact, **columns)
+
+    def columnar(columns):
+        record_batch = pa.RecordBatch.from_pydict(
+            {name: pa.array(values) for name, values in columns.items()}
+        )
+        return batch_calculator.calculate_batch(
+            exact=exact, **record_batch_to_columns(record_batch, batch_calculator)
+        )
+
+    implementations = {'batch': (batch, fields), 'profile': (profile, fields), 'columnar': (columnar, fields)}
+
+    if not exact:
+        surface = ResponseSurface(calculator=calculator)
+
+        def response_surface(columns):
+            return {'total_standard_time': np.asarray(
+                [surface.total_standard_time(**arguments) for arguments in _row_arguments(columns)]
+            )}
+
+        implementations['surface'] = (response_surface, ('total_standard_time',))
+
+    if pool is not None:
+        def worker_pool(columns):
+            futures = [pool.submit(exact=exact, **arguments) for arguments in _row_arguments(columns)]
+            results = [future.result() for future in futures]
+            return {field: np.asarray([result[field] for result in results]) for field in fields}
+
+        implementations['pool'] = (worker_pool, fields)
+
+    return implementations
+
+
+def compare_results(expected: Dict[str, np.ndarray],
+                    actual: Dict[str, np.ndarray],
+                    fields: Tuple[str, ...] = RESULT_FIELDS) -> Dict[str, np.ndarray]:
+    """
+    Compare the given output fields.
+
+    Returns:
+        Field name to indices of mismatching rows (fields with mismatches only)
+    """
+    mismatches = {}
+    for field in fields:
+        size = len(expected[field])
+        different = np.broadcast_to(actual[field], (size,)) != expected[field]
+        if different.any():
+            mismatches[field] = np.flatnonzero(different)
+    return mismatches
+
+
+def run_harness(count: int, chunk_size: int, seed: int, exact: bool,
+                pool: Optional[WorkerPool] = None, log: Callable[[str], None] = print) -> bool:
+    """
+    Run the differential comparison over a random corpus.
+
+    Args:
+        count: Number of generated input rows
+        chunk_size: Rows generated and compared at a time
+        seed: Random seed for a reproducible corpus
+        exact: Compare the fixed-point mode instead of the rounded mode
+        pool: Worker pool to compare as well (default parameters)
+        log: Output function
+
+    Returns:
+        Whether every implementation matched the reference on every field
+    """
+    calculator = GunDrillTimeCalculator()
+    implementations = build_implementations(calculator, exact, pool)
+    rng = np.random.default_rng(seed)
+
+    elapsed = {'reference': 0.0, **{name: 0.0 for name in implementations}}
+    mismatch_counts = {name: {} for name in implementations}
+    examples: List[str] = []
+    done = 0
+
+    while done < count:
+        size = min(chunk_size, count - done)
+        columns = generate_inputs(rng, size)
+
+        start = time.perf_counter()
+        expected = reference_results(calculator, columns, exact)
+        elapsed['reference'] += time.perf_counter() - start
+
+        for name, (implementation, fields) in implementations.items():
+            start = time.perf_counter()
+            actual = implementation(columns)
+            elapsed[name] += time.perf_counter() - start
+
+            for field, rows in compare_results(expected, actual, fields).items():
+                mismatch_counts[name][field] = mismatch_counts[name].get(field, 0) + len(rows)
+                if len(examples) < 10:
+                    row = int(rows[0])
+                    inputs = {key: values[row] for key, values in columns.items()}
+                    examples.append(f"{name}.{field}: expected {expected[field][row]!r}, "
+                                    f"got {np.broadcast_to(actual[field], (size,))[row]!r} for {inputs}")
+        done += size
+
+    mode = 'exact' if exact else 'rounded'
+    log(f"Equivalence Results ({mode} mode, {count} rows, seed {seed}):")
+    log("=" * 40)
+    for name, seconds in elapsed.items():
+        throughput = count / seconds if seconds else float('inf')
+        status = ''
+        if name in mismatch_counts:
+            failures = mismatch_counts[name]
+            status = 'OK' if not failures else 'MISMATCH ' + ', '.join(f"{f}={n}" for f, n in failures.items())
+        log(f"{name:>10}: {throughput:14,.0f} rows/s  {status}")
+    for example in examples:
+        log(f"  {example}")
+
+    return all(not failures for failures in mismatch_counts.values())
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=1_000_000, help='number of random input rows')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='rows compared at a time')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--workers', type=int, default=2, help='worker pool processes (0 to skip the pool)')
+    args = parser.parse_args()
+
+    passed = True
+    worker_pool = WorkerPool(workers=args.workers) if args.workers else None
+    try:
+        for exact in (False, True):
+            passed &= run_harness(args.count, args.chunk_size, args.seed, exact, worker_pool)
+            print()
+    finally:
+        if worker_pool is not None:
+            worker_pool.close()
+    sys.exit(0 if passed else 1)
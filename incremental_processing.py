@@ -0,0 +1,228 @@
+"""
+Gun Drill Machine Standard Time Calculator - Incremental Reprocessing
+This module fingerprints time-study input rows together with the calculator
+configuration and keeps the results of earlier runs, so a re-run only
+recomputes the rows whose content (or the configuration) has changed.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from typing import Dict, Any, Callable, Iterable, List, Mapping, Optional
+
+import pandas as pd
+
+from calculation_formulas import GunDrillTimeCalculator
+
+# Bump when the cache layout or the meaning of cached results changes
+CACHE_VERSION = 1
+
+
+def _digest(payload: Any) -> str:
+    """Stable hash of a JSON-serializable payload."""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def fingerprint_row(row: Mapping[str, Any]) -> str:
+    """
+    Fingerprint one input row by its column names and values.
+
+    Args:
+        row: Mapping of column name to value
+
+    Returns:
+        Hex digest identifying the row content
+    """
+    return _digest([[str(key), row[key]] for key in row])
+
+
+def _source_fingerprint(obj: Any) -> Optional[str]:
+    """Fingerprint of the source file defining obj (None if it has none)."""
+    try:
+        path = inspect.getsourcefile(obj)
+    except TypeError:
+        return None
+    return fingerprint_file(path) if path and os.path.exists(path) else None
+
+
+def fingerprint_calculator(calculator: GunDrillTimeCalculator) -> str:
+    """
+    Fingerprint the configuration of a calculator.
+
+    Any change to the default times, the tool wear factor or the material
+    factors, or to the source of the module defining the calculator (where
+    the size, RPM, setup, grinding and inspection factors are hard-coded),
+    produces a different fingerprint and invalidates cached rows.
+
+    Args:
+        calculator: Calculator instance
+
+    Returns:
+        Hex digest identifying the configuration
+    """
+    return _digest({
+        'class': type(calculator).__name__,
+        'version': CACHE_VERSION,
+        'parameters': vars(calculator),
+        'source': _source_fingerprint(type(calculator)),
+    })
+
+
+def fingerprint_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Fingerprint the raw bytes of a file.
+
+    Args:
+        path: File path
+        chunk_size: Bytes read at a time
+
+    Returns:
+        Hex digest of the file content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IncrementalProcessor:
+    """
+    Row-level result cache for reprocessing time-study sheets.
+
+    Results are stored by row fingerprint in a JSON file, so edited, inserted
+    or reordered rows only cost the rows that actually changed. A changed
+    calculator configuration, process name or source of the module defining
+    process_row discards the whole cache.
+    """
+
+    def __init__(self,
+                 cache_path: str,
+                 process_row: Callable[[Dict[str, Any], int], Any],
+                 calculator: Optional[GunDrillTimeCalculator] = None,
+                 name: str = 'default'):
+        """
+        Initialize the processor.
+
+        Args:
+            cache_path: JSON file holding results of previous runs
+            process_row: Function computing a JSON-serializable result from a
+                row and its position in the input
+            calculator: Calculator whose configuration the results depend on
+            name: Identifies the processing step (e.g. the sheet being reconciled)
+        """
+        self.cache_path = cache_path
+        self.process_row = process_row
+        self.calculator = calculator if calculator is not None else GunDrillTimeCalculator()
+        self.name = name
+        self.last_run_stats = {'rows': 0, 'recomputed': 0, 'reused': 0}
+        self._cache = None
+
+    def _config_fingerprint(self) -> str:
+        """Fingerprint of everything besides the row that affects a result."""
+        return _digest([
+            self.name,
+            fingerprint_calculator(self.calculator),
+            _source_fingerprint(self.process_row),
+        ])
+
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load the cache, discarding it if it belongs to another configuration."""
+        config = self._config_fingerprint()
+        if self._cache is not None and self._cache['config'] == config:
+            return self._cache
+
+        cache = None
+        if os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as handle:
+                    cache = json.load(handle)
+            except (OSError, ValueError):
+                cache = None
+        if not cache or cache.get('config') != config:
+            cache = {'config': config, 'file': None, 'order': [], 'rows': {}}
+        self._cache = cache
+        return cache
+
+    def _save_cache(self, cache: Dict[str, Any]):
+        """Atomically write the cache file."""
+        temporary_path = f"{self.cache_path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as handle:
+            json.dump(cache, handle)
+        os.replace(temporary_path, self.cache_path)
+
+    def run(self,
+            rows: Iterable[Mapping[str, Any]],
+            file_fingerprint: Optional[str] = None,
+            row_keys: Optional[Iterable[str]] = None) -> List[Any]:
+        """
+        Process rows, recomputing only those whose fingerprint is not cached.
+
+        Args:
+            rows: Input rows as mappings of column name to value
+            file_fingerprint: Fingerprint of the source file, if any
+            row_keys: Precomputed row fingerprints (e.g. of the raw text),
+                used instead of fingerprinting the rows themselves
+
+        Returns:
+            List of per-row results in input order
+        """
+        cache = self._load_cache()
+        previous = cache['rows']
+        current = {}
+        order = []
+        recomputed = 0
+
+        row_keys = iter(row_keys) if row_keys is not None else None
+        for index, row in enumerate(rows):
+            row = dict(row)
+            key = next(row_keys) if row_keys is not None else fingerprint_row(row)
+            order.append(key)
+            if key in current:
+                continue
+            if key in previous:
+                current[key] = previous[key]
+            else:
+                current[key] = self.process_row(row, index)
+                recomputed += 1
+
+        changed = recomputed > 0 or set(current) != set(previous) or order != cache['order']
+        cache.update({'file': file_fingerprint, 'order': order, 'rows': current})
+        if changed or file_fingerprint is not None:
+            self._save_cache(cache)
+
+        self.last_run_stats = {'rows': len(order), 'recomputed': recomputed, 'reused': len(order) - recomputed}
+        return [current[key] for key in order]
+
+    def run_csv(self, path: str, **read_csv_kwargs: Any) -> List[Any]:
+        """
+        Process every row of a CSV file incrementally.
+
+        When neither the file bytes, the parse options nor the configuration
+        changed since the last run, the cached results are returned without
+        parsing the file. Rows are fingerprinted by their raw text, so an edit
+        that changes the inferred type of a column (e.g. 1 becoming 1.0) only
+        recomputes the edited rows; process_row still gets the typed values.
+
+        Args:
+            path: CSV file path
+            **read_csv_kwargs: Extra arguments for pandas.read_csv
+
+        Returns:
+            List of per-row results in file order
+        """
+        file_fingerprint = _digest([fingerprint_file(path), read_csv_kwargs])
+        cache = self._load_cache()
+        if cache['file'] == file_fingerprint:
+            self.last_run_stats = {'rows': len(cache['order']), 'recomputed': 0, 'reused': len(cache['order'])}
+            return [cache['rows'][key] for key in cache['order']]
+
+        frame = pd.read_csv(path, **read_csv_kwargs)
+        raw_kwargs = {key: value for key, value in read_csv_kwargs.items()
+                      if key not in ('dtype', 'converters', 'keep_default_na', 'na_values')}
+        raw_frame = pd.read_csv(path, dtype=str, keep_default_na=False, **raw_kwargs)
+        options = _digest(read_csv_kwargs)
+        row_keys = [_digest([options, fingerprint_row(row)]) for row in raw_frame.to_dict('records')]
+        return self.run(frame.to_dict('records'), file_fingerprint=file_fingerprint, row_keys=row_keys)
@@ -0,0 +1,203 @@
+"""
+Gun Drill Machine Standard Time Calculator - Inverse Solver
+This module answers the quoting question in reverse: for a target total
+standard time, how long a hole can be drilled or how many features fit.
+Both solves are vectorized over whole batches of cases.
+"""
+
+import math
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from calculation_formulas import GunDrillTimeCalculator
+from batch_calculation import BatchTimeCalculator
+
+# Limits from GunDrillTimeCalculator.validate_input_parameters
+MAX_LENGTH_TO_DRILL = 1000.0  # mm
+MAX_NUMBER_OF_FEATURES = 100
+
+
+class InverseTimeSolver:
+    """
+    Vectorized inverse of calculate_total_standard_time.
+
+    The total standard time is non-decreasing in both length_to_drill and
+    number_of_features (every component is), so the largest value meeting a
+    target is found by bisection. The piecewise drill size, RPM and material
+    factors do not depend on length, so for a given row the unrounded total
+    is affine in length; the solver uses that line to narrow each row's
+    bracket before bisecting over the rounded totals.
+    """
+
+    def __init__(self, calculator: Optional[GunDrillTimeCalculator] = None):
+        """Initialize the solver with a calculator (default parameters if None)."""
+        self.batch_calculator = BatchTimeCalculator(calculator)
+
+    def _prepare(self, target_time: Any, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode materials and broadcast every column to the batch shape."""
+        columns = dict(columns)
+        columns['material_code'] = self.batch_calculator.encode_materials(columns.pop('material_grade'))
+        names = ['target_time'] + list(columns)
+        arrays = np.broadcast_arrays(
+            np.asarray(target_time, dtype=np.float64),
+            *[np.nan if value is None else value for value in columns.values()]
+        )
+        return {name: np.ravel(array) for name, array in zip(names, arrays)}
+
+    def _total_time(self, columns: Dict[str, Any], exact: bool, **overrides: Any) -> np.ndarray:
+        """Total standard time for the batch with some columns replaced."""
+        arguments = {name: value for name, value in columns.items() if name != 'target_time'}
+        arguments.update(overrides)
+        return self.batch_calculator.calculate_batch(exact=exact, **arguments)['total_standard_time']
+
+    def solve_max_length(self,
+                         target_time: Any,
+                         drill_size: Any,
+                         rpm: Any,
+                         feed_rate: Any,
+                         material_grade: Any,
+                         number_of_features: Any = 1,
+                         tool_wear_consideration: Any = True,
+                         wall_thickness_inspection: Any = False,
+                         custom_setup_time: Optional[Any] = None,
+                         custom_grinding_time: Optional[Any] = None,
+                         grinding_frequency: Any = 10,
+                         exact: bool = False,
+                         tolerance: float = 0.01,
+                         max_length: float = MAX_LENGTH_TO_DRILL) -> np.ndarray:
+        """
+        Find the maximum length to drill whose total standard time meets a target.
+
+        Args:
+            target_time: Target total standard time (minutes)
+            drill_size .. grinding_frequency: As for calculate_total_standard_time
+            exact: Evaluate totals with the fixed-point mode
+            tolerance: Length resolution of the answer (mm)
+            max_length: Upper bound of the search (mm)
+
+        Returns:
+            Array of maximum lengths (mm); NaN where even a zero length exceeds
+            the target, max_length where the whole range fits
+        """
+        columns = self._prepare(target_time, {
+            'drill_size': drill_size, 'rpm': rpm, 'feed_rate': feed_rate,
+            'material_grade': material_grade, 'number_of_features': number_of_features,
+            'tool_wear_consideration': tool_wear_consideration,
+            'wall_thickness_inspection': wall_thickness_inspection,
+            'custom_setup_time': custom_setup_time, 'custom_grinding_time': custom_grinding_time,
+            'grinding_frequency': grinding_frequency,
+        })
+        target = columns['target_time']
+        size = target.shape[0]
+
+        lo = np.zeros(size)
+        hi = np.full(size, float(max_length))
+        time_at_lo = self._total_time(columns, exact, length_to_drill=lo)
+        time_at_hi = self._total_time(columns, exact, length_to_drill=hi)
+        infeasible = time_at_lo > target
+        fits_whole_range = time_at_hi <= target
+
+        # Narrow the bracket around the affine estimate. Each rounded component
+        # is within 0.005 min of its exact value, scaled by the feature count.
+        slope = (time_at_hi - time_at_lo) / max_length
+        features = columns['number_of_features']
+        slack = 0.005 * (2 * features + 4) * 1.1 + 0.01
+        with np.errstate(divide='ignore', invalid='ignore'):
+            estimate = (target - time_at_lo) / slope
+            margin = slack / slope
+        guess_lo = np.clip(estimate - margin, 0.0, max_length)
+        guess_hi = np.clip(estimate + margin, 0.0, max_length)
+        usable = np.isfinite(estimate) & np.isfinite(margin)
+        usable &= self._total_time(columns, exact, length_to_drill=guess_lo) <= target
+        usable &= self._total_time(columns, exact, length_to_drill=guess_hi) > target
+        lo = np.where(usable, guess_lo, lo)
+        hi = np.where(usable, guess_hi, hi)
+
+        # Bisect on the rounded totals: lo always meets the target, hi never does
+        width = float(np.max(hi - lo)) if size else 0.0
+        iterations = max(0, math.ceil(math.log2(width / tolerance))) if width > tolerance else 0
+        for _ in range(iterations):
+            mid = (lo + hi) / 2
+            meets_target = self._total_time(columns, exact, length_to_drill=mid) <= target
+            lo = np.where(meets_target, mid, lo)
+            hi = np.where(meets_target, hi, mid)
+
+        result = np.where(fits_whole_range, float(max_length), lo)
+        return np.where(infeasible, np.nan, result)
+
+    def solve_max_features(self,
+                           target_time: Any,
+                           drill_size: Any,
+                           length_to_drill: Any,
+                           rpm: Any,
+                           feed_rate: Any,
+                           material_grade: Any,
+                           tool_wear_consideration: Any = True,
+                           wall_thickness_inspection: Any = False,
+                           custom_setup_time: Optional[Any] = None,
+                           custom_grinding_time: Optional[Any] = None,
+                           grinding_frequency: Any = 10,
+                           exact: bool = False,
+                           max_features: int = MAX_NUMBER_OF_FEATURES) -> np.ndarray:
+        """
+        Find the maximum number of features whose total standard time meets a target.
+
+        Args:
+            target_time: Target total standard time (minutes)
+            drill_size .. grinding_frequency: As for calculate_total_standard_time
+            exact: Evaluate totals with the fixed-point mode
+            max_features: Upper bound of the search
+
+        Returns:
+            Integer array of maximum feature counts; 0 where a single feature
+            already exceeds the target
+        """
+        columns = self._prepare(target_time, {
+            'drill_size': drill_size, 'length_to_drill': length_to_drill, 'rpm': rpm,
+            'feed_rate': feed_rate, 'material_grade': material_grade,
+            'tool_wear_consideration': tool_wear_consideration,
+            'wall_thickness_inspection': wall_thickness_inspection,
+            'custom_setup_time': custom_setup_time, 'custom_grinding_time': custom_grinding_time,
+            'grinding_frequency': grinding_frequency,
+        })
+        target = columns['target_time']
+        size = target.shape[0]
+
+        # Integer bisection: lo always meets the target (0 features trivially), hi never does
+        lo = np.zeros(size, dtype=np.int64)
+        hi = np.full(size, max_features + 1, dtype=np.int64)
+        active = hi - lo > 1
+        while np.any(active):
+            mid = np.maximum((lo + hi) // 2, 1)
+            meets_target = self._total_time(columns, exact, number_of_features=mid) <= target
+            lo = np.where(active & meets_target, mid, lo)
+            hi = np.where(active & ~meets_target, mid, hi)
+            active = hi - lo > 1
+        return lo
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    solver = InverseTimeSolver()
+    calculator = GunDrillTimeCalculator()
+
+    targets = np.array([10.0, 15.0, 20.0, 30.0])
+    lengths = solver.solve_max_length(
+        targets, drill_size=10.0, rpm=1800, feed_rate=80.0, material_grade='Steel',
+        number_of_features=2, wall_thickness_inspection=True
+    )
+    features = solver.solve_max_features(
+        targets, drill_size=10.0, length_to_drill=100.0, rpm=1800, feed_rate=80.0,
+        material_grade='Steel', wall_thickness_inspection=True
+    )
+
+    print("Inverse Solver Results:")
+    print("=" * 40)
+    for target, length, count in zip(targets, lengths, features):
+        check = calculator.calculate_total_standard_time(
+            10.0, float(length), 1800, 80.0, 'Steel', number_of_features=2,
+            wall_thickness_inspection=True
+        )['total_standard_time']
+        print(f"Target {target} min: max length {length:.2f} mm (total {check}), "
+              f"max features at 100 mm {count}")
@@ -0,0 +1,336 @@
+"""
+Gun Drill Machine Standard Time Calculator - Precomputed Response Surface
+This module tabulates total_standard_time over a discrete grid of inputs
+(front-end drill sizes, standard materials, common RPM/feed/length steps)
+so that on-grid requests are answered by direct index lookup. Off-grid
+requests fall back to the full GunDrillTimeCalculator. The table can be
+exported as a compact JSON file (int32 centiminutes split into byte
+planes, zlib-compressed and base64 encoded) for the front end to load.
+"""
+
+import base64
+import json
+import zlib
+from array import array
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from calculation_formulas import GunDrillTimeCalculator, OUTPUT_UNITS_PER_MINUTE
+from batch_calculation import BatchTimeCalculator
+
+MM_PER_INCH = 25.4
+
+# Presets of the React front end (FMJCalculator DRILL_SIZES and
+# OPERATION_PARAMS, App DRILL_TABLE), in inches, inches/min and rpm
+FRONT_END_DRILL_SIZES_IN = (0.375, 0.21, 0.299, 0.25, 0.187, 0.2, 0.63, 0.69, 0.75, 0.889)
+FRONT_END_LENGTHS_IN = (0.73, 1.3, 1.4, 1.402, 0.65)
+FRONT_END_FEED_RATES_IN = (0.8, 0.35, 0.6, 0.5, 0.2, 0.15, 0.12)
+FRONT_END_RPMS = (1800, 1100, 2100, 900, 700, 600, 100)
+
+# Numeric lookup keys are rounded to this many decimals, so 9.525 and
+# 0.375 * 25.4 (9.524999999999999) find the same drill size entry
+KEY_DECIMALS = 4
+# Largest difference between an input and its grid value still treated as on-grid
+KEY_TOLERANCE = 1e-9
+
+# Largest total the int32 centiminute table can hold (about 21.4 million minutes)
+TABLE_MAX_CENTIMINUTES = np.iinfo(np.int32).max
+
+SURFACE_FORMAT = 'gun-drill-response-surface'
+SURFACE_VERSION = 2
+
+# Grid axes in lookup order
+AXES = (
+    'drill_size',
+    'material_grade',
+    'rpm',
+    'feed_rate',
+    'length_to_drill',
+    'number_of_features',
+    'tool_wear_consideration',
+    'wall_thickness_inspection',
+)
+# Axes whose lookup keys are rounded to KEY_DECIMALS
+NUMERIC_AXES = ('drill_size', 'rpm', 'feed_rate', 'length_to_drill')
+
+
+def default_axes(calculator: Optional[GunDrillTimeCalculator] = None) -> Dict[str, list]:
+    """
+    Default grid: the front-end presets, converted to metric.
+
+    Values are converted exactly as a client would (inches * 25.4, without
+    rounding), so the table entries equal the calculator's results for them.
+
+    Args:
+        calculator: Calculator whose material list is used
+
+    Returns:
+        Axis name to list of grid values
+    """
+    calculator = calculator if calculator is not None else GunDrillTimeCalculator()
+    return {
+        'drill_size': sorted(size * MM_PER_INCH for size in FRONT_END_DRILL_SIZES_IN),
+        'material_grade': list(calculator.material_factors),
+        'rpm': sorted(float(rpm) for rpm in FRONT_END_RPMS),
+        'feed_rate': sorted(feed * MM_PER_INCH for feed in FRONT_END_FEED_RATES_IN),
+        'length_to_drill': sorted(length * MM_PER_INCH for length in FRONT_END_LENGTHS_IN),
+        'number_of_features': [1, 2, 3, 4],
+        'tool_wear_consideration': [True],
+        'wall_thickness_inspection': [False, True],
+    }
+
+
+class ResponseSurface:
+    """
+    Lookup table of total standard time over a discrete input grid.
+    """
+
+    def __init__(self,
+                 axes: Optional[Dict[str, Sequence[Any]]] = None,
+                 calculator: Optional[GunDrillTimeCalculator] = None,
+                 grinding_frequency: int = 10,
+                 table: Optional[np.ndarray] = None):
+        """
+        Initialize the surface, computing the table unless one is given.
+
+        Args:
+            axes: Axis name to grid values (default_axes() if None)
+            calculator: Calculator used to build the table and for fallbacks
+            grinding_frequency: Grinding frequency the table is computed for
+            table: Precomputed int32 centiminute table (e.g. from load())
+        """
+        self.calculator = calculator if calculator is not None else GunDrillTimeCalculator()
+        axes = axes if axes is not None else default_axes(self.calculator)
+        self.axes = {name: list(axes[name]) for name in AXES}
+        self.grinding_frequency = grinding_frequency
+        self.shape = tuple(len(self.axes[name]) for name in AXES)
+
+        self.table = table if table is not None else self._build()
+        if self.table.shape != self.shape:
+            raise ValueError(f"Table shape {self.table.shape} does not match axes {self.shape}")
+
+        # Value to flat-offset maps (position times stride) for each axis;
+        # materials match case-insensitively like the calculator, numeric
+        # values by their rounded keys
+        self._offsets = []
+        for axis, name in enumerate(AXES):
+            stride = int(np.prod(self.shape[axis + 1:], dtype=np.int64))
+            keys = self.axes[name]
+            if name == 'material_grade':
+                keys = [str(value).lower() for value in keys]
+            elif name in NUMERIC_AXES:
+                keys = [round(float(value), KEY_DECIMALS) for value in keys]
+                if any(abs(value - key) > KEY_TOLERANCE for value, key in zip(self.axes[name], keys)) \
+                        or len(set(keys)) != len(keys):
+                    raise ValueError(f"{name} grid values must be distinct with at most {KEY_DECIMALS} decimals")
+                # Exact grid values are keys too, so the common case needs no rounding
+                offsets = {value: position * stride for position, value in enumerate(self.axes[name])}
+                offsets.update({key: position * stride for position, key in enumerate(keys)})
+                self._offsets.append(offsets)
+                continue
+            self._offsets.append({key: position * stride for position, key in enumerate(keys)})
+        self._flat = array('i', self.table.astype(np.int32).tobytes())
+
+    def _build(self) -> np.ndarray:
+        """
+        Evaluate the calculator over the whole grid, one drill size at a time.
+
+        Raises:
+            ValueError: If a total exceeds the int32 centiminute table range
+        """
+        batch_calculator = BatchTimeCalculator(self.calculator)
+        table = np.empty(self.shape, dtype=np.int32)
+        inner_shape = self.shape[1:]
+        grid = [values.ravel() for values in np.meshgrid(
+            *[np.arange(length) for length in inner_shape], indexing='ij'
+        )]
+
+        def column(name, dtype):
+            return np.asarray(self.axes[name], dtype=dtype)[grid[AXES.index(name) - 1]]
+
+        material_code = batch_calculator.encode_materials(self.axes['material_grade'])[grid[0]]
+        for i, drill_size in enumerate(self.axes['drill_size']):
+            results = batch_calculator.calculate_batch(
+                drill_size=drill_size,
+                length_to_drill=column('length_to_drill', np.float64),
+                rpm=column('rpm', np.float64),
+                feed_rate=column('feed_rate', np.float64),
+                material_code=material_code,
+                number_of_features=column('number_of_features', np.int64),
+                tool_wear_consideration=column('tool_wear_consideration', bool),
+                wall_thickness_inspection=column('wall_thickness_inspection', bool),
+                grinding_frequency=self.grinding_frequency
+            )
+            centiminutes = np.rint(results['total_standard_time'] * OUTPUT_UNITS_PER_MINUTE)
+            largest = centiminutes.max(initial=0)
+            if not largest <= TABLE_MAX_CENTIMINUTES:
+                raise ValueError(
+                    f"Total standard time {largest / OUTPUT_UNITS_PER_MINUTE} min at drill size {drill_size} "
+                    f"exceeds the int32 table range ({TABLE_MAX_CENTIMINUTES / OUTPUT_UNITS_PER_MINUTE} min); "
+                    f"narrow the feed rate or length axes"
+                )
+            table[i] = centiminutes.astype(np.int32).reshape(inner_shape)
+        return table
+
+    def lookup(self,
+               drill_size: float,
+               length_to_drill: float,
+               rpm: float,
+               feed_rate: float,
+               material_grade: str,
+               number_of_features: int = 1,
+               tool_wear_consideration: bool = True,
+               wall_thickness_inspection: bool = False) -> Optional[float]:
+        """
+        Table value for the inputs, or None when they are not on the grid.
+
+        Numeric inputs within KEY_TOLERANCE of a grid value (after rounding to
+        KEY_DECIMALS) count as on the grid and get that grid point's value, so
+        both 9.525 and 0.375 * 25.4 hit the table.
+
+        Returns:
+            Total standard time in minutes, or None
+        """
+        offsets = self._offsets
+        try:
+            index = (offsets[1][material_grade.lower()] + offsets[5][number_of_features]
+                     + offsets[6][tool_wear_consideration] + offsets[7][wall_thickness_inspection])
+            for axis, value in ((0, drill_size), (2, rpm), (3, feed_rate), (4, length_to_drill)):
+                offset = offsets[axis].get(value)
+                if offset is None:
+                    key = round(value, KEY_DECIMALS)
+                    if abs(value - key) > KEY_TOLERANCE:
+                        return None
+                    offset = offsets[axis][key]
+                index += offset
+        except KeyError:
+            return None
+        return self._flat[index] / OUTPUT_UNITS_PER_MINUTE
+
+    def total_standard_time(self,
+                            drill_size: float,
+                            length_to_drill: float,
+                            rpm: float,
+                            feed_rate: float,
+                            material_grade: str,
+                            number_of_features: int = 1,
+                            tool_wear_consideration: bool = True,
+                            wall_thickness_inspection: bool = False,
+                            custom_setup_time: Optional[float] = None,
+                            custom_grinding_time: Optional[float] = None,
+                            grinding_frequency: int = 10) -> float:
+        """
+        Total standard time, from the table when the inputs are on the grid.
+
+        Args:
+            Same as GunDrillTimeCalculator.calculate_total_standard_time
+
+        Returns:
+            Total standard time in minutes
+        """
+        if custom_setup_time is None and custom_grinding_time is None \
+                and grinding_frequency == self.grinding_frequency:
+            value = self.lookup(drill_size, length_to_drill, rpm, feed_rate, material_grade,
+                                number_of_features, tool_wear_consideration, wall_thickness_inspection)
+            if value is not None:
+                return value
+
+        return self.calculator.calculate_total_standard_time(
+            drill_size, length_to_drill, rpm, feed_rate, material_grade,
+            number_of_features=number_of_features,
+            tool_wear_consideration=tool_wear_consideration,
+            wall_thickness_inspection=wall_thickness_inspection,
+            custom_setup_time=custom_setup_time,
+            custom_grinding_time=custom_grinding_time,
+            grinding_frequency=grinding_frequency
+        )['total_standard_time']
+
+    def export(self, path: str) -> int:
+        """
+        Write the table as a compact JSON file for the front end.
+
+        The data field holds the int32 little-endian centiminute table in
+        C order over AXES, stored as four byte planes (all lowest bytes
+        first, then the next, ...), zlib-compressed and base64 encoded.
+        Splitting the planes lets zlib exploit the mostly-constant high bytes.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Size of the written file in bytes
+        """
+        planes = self.table.astype('<i4').view(np.uint8).reshape(-1, 4).T
+        data = zlib.compress(planes.tobytes(), 9)
+        document = {
+            'format': SURFACE_FORMAT,
+            'version': SURFACE_VERSION,
+            'axes': [{'name': name, 'values': self.axes[name]} for name in AXES],
+            'grinding_frequency': self.grinding_frequency,
+            'units': 'centiminutes',
+            'dtype': 'int32',
+            'layout': 'byte-planes',
+            'compression': 'zlib',
+            'data': base64.b64encode(data).decode('ascii'),
+        }
+        encoded = json.dumps(document, separators=(',', ':'))
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(encoded)
+        return len(encoded)
+
+    @classmethod
+    def load(cls, path: str, calculator: Optional[GunDrillTimeCalculator] = None) -> 'ResponseSurface':
+        """
+        Load a surface written by export().
+
+        Args:
+            path: Surface file path
+            calculator: Calculator for off-grid fallbacks
+
+        Returns:
+            ResponseSurface instance
+        """
+        with open(path, 'r', encoding='utf-8') as handle:
+            document = json.load(handle)
+        if document.get('format') != SURFACE_FORMAT or document.get('version') != SURFACE_VERSION:
+            raise ValueError(f"Unsupported response surface file: {path}")
+        axes = {axis['name']: axis['values'] for axis in document['axes']}
+        shape = tuple(len(axes[name]) for name in AXES)
+        planes = np.frombuffer(zlib.decompress(base64.b64decode(document['data'])), dtype=np.uint8)
+        table = np.ascontiguousarray(planes.reshape(4, -1).T).view('<i4').astype(np.int32).reshape(shape)
+        return cls(axes, calculator, document['grinding_frequency'], table)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    start = time.perf_counter()
+    surface = ResponseSurface()
+    print("Response Surface:")
+    print("=" * 40)
+    print(f"Grid {surface.shape} = {surface.table.size} points built in {time.perf_counter() - start:.2f}s")
+
+    export_path = os.path.join(tempfile.gettempdir(), 'gun_drill_response_surface.json')
+    print(f"Exported {surface.export(export_path)} bytes to {export_path}")
+
+    # Front-end low chrome 0.375" drill preset, converted to metric
+    case = {
+        'drill_size': 0.375 * MM_PER_INCH, 'length_to_drill': 0.73 * MM_PER_INCH, 'rpm': 1800,
+        'feed_rate': 0.8 * MM_PER_INCH, 'material_grade': 'Steel', 'number_of_features': 2,
+        'wall_thickness_inspection': True,
+    }
+    repeats = 100_000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        value = surface.total_standard_time(**case)
+    lookup_us = (time.perf_counter() - start) / repeats * 1e6
+    start = time.perf_counter()
+    for _ in range(repeats):
+        reference = surface.calculator.calculate_total_standard_time(**case)['total_standard_time']
+    calculate_us = (time.perf_counter() - start) / repeats * 1e6
+    print(f"On-grid lookup {value} in {lookup_us:.2f} us (calculator {reference} in {calculate_us:.2f} us)")
+    print(f"Off-grid fallback: {surface.total_standard_time(**dict(case, rpm=1234.5))}")
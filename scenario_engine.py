@@ -0,0 +1,229 @@
+"""
+Gun Drill Machine Standard Time Calculator - What-If Scenario Engine
+This module re-costs stored historical calculation inputs under proposed
+parameter changes (e.g. default_setup_time, tool_wear_factor or material
+factors) and streams baseline-vs-scenario deltas. History is read and
+evaluated one chunk at a time, so memory stays bounded however many
+records or scenarios are compared.
+"""
+
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from calculation_formulas import (
+    GunDrillTimeCalculator,
+    FIXED_POINT_UNITS_PER_MINUTE,
+    OUTPUT_UNITS_PER_MINUTE,
+    from_fixed_point,
+)
+from batch_calculation import BatchTimeCalculator, sum_units
+from columnar_io import DEFAULT_BATCH_SIZE, iter_record_batches, record_batch_to_columns
+
+
+def _signed_from_fixed_point(units: int) -> float:
+    """from_fixed_point for deltas that may be negative (rounds half away from zero)."""
+    minutes = from_fixed_point(abs(units))
+    return -minutes if units < 0 else minutes
+
+
+class Scenario:
+    """
+    A named set of calculator parameter overrides.
+
+    material_factors overrides are merged into the baseline factors, so only
+    the materials being changed need to be listed.
+    """
+
+    def __init__(self, name: str, overrides: Dict[str, Any]):
+        """
+        Initialize the scenario.
+
+        Args:
+            name: Scenario name used in reports
+            overrides: Calculator attribute name to new value
+        """
+        self.name = name
+        self.overrides = overrides
+
+    def apply(self, calculator: GunDrillTimeCalculator) -> GunDrillTimeCalculator:
+        """
+        Create a copy of a calculator with the scenario overrides applied.
+
+        Args:
+            calculator: Baseline calculator (left unchanged)
+
+        Returns:
+            New calculator instance
+
+        Raises:
+            ValueError: If an override names an unknown calculator parameter
+        """
+        return calculator.with_overrides(self.overrides)
+
+
+def history_from_file(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Callable[[], Iterator[pa.RecordBatch]]:
+    """
+    Use a Parquet or Arrow IPC file of past calculation inputs as history.
+
+    Args:
+        path: Columnar input file (see columnar_io.INPUT_COLUMNS)
+        batch_size: Rows per chunk
+
+    Returns:
+        Callable returning a fresh iterator of record batches
+    """
+    return lambda: iter_record_batches(path, batch_size)
+
+
+def history_from_columns(columns: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE) -> Callable[[], Iterator[pa.RecordBatch]]:
+    """
+    Use in-memory input columns as history.
+
+    Args:
+        columns: Mapping of input column names to sequences
+        batch_size: Rows per chunk
+
+    Returns:
+        Callable returning a fresh iterator of record batches
+    """
+    table = pa.table(columns)
+    return lambda: iter(table.to_batches(max_chunksize=batch_size))
+
+
+class ScenarioEngine:
+    """
+    Lazy, chunked comparison of scenarios against a baseline calculator.
+    """
+
+    def __init__(self,
+                 history: Callable[[], Iterable[pa.RecordBatch]],
+                 baseline: Optional[GunDrillTimeCalculator] = None,
+                 exact: bool = True):
+        """
+        Initialize the engine.
+
+        Args:
+            history: Callable returning an iterator of input record batches
+            baseline: Calculator with the current parameters
+            exact: Use the fixed-point mode so totals are reproducible
+        """
+        self.history = history
+        self.baseline = baseline if baseline is not None else GunDrillTimeCalculator()
+        self.exact = exact
+
+    def _total_units(self, batch_calculator: BatchTimeCalculator, batch: pa.RecordBatch) -> np.ndarray:
+        """Per-row total standard time of a chunk in comparable integer units."""
+        results = batch_calculator.calculate_batch(
+            exact=self.exact, **record_batch_to_columns(batch, batch_calculator)
+        )
+        if self.exact:
+            return results['total_standard_time_units']
+        output_units = np.rint(results['total_standard_time'] * OUTPUT_UNITS_PER_MINUTE).astype(np.int64)
+        return output_units * (FIXED_POINT_UNITS_PER_MINUTE // OUTPUT_UNITS_PER_MINUTE)
+
+    def iter_deltas(self, scenarios: List[Scenario]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream baseline-vs-scenario deltas chunk by chunk.
+
+        The baseline is evaluated once per chunk and shared by all scenarios.
+        Nothing is evaluated until the generator is consumed.
+
+        Args:
+            scenarios: Scenarios to compare
+
+        Yields:
+            Dictionary per chunk and scenario with the scenario name, the
+            chunk's row offset and per-row baseline, scenario and delta times
+            in FIXED_POINT_UNITS_PER_MINUTE units
+        """
+        baseline_calculator = BatchTimeCalculator(self.baseline)
+        scenario_calculators = [
+            (scenario.name, BatchTimeCalculator(scenario.apply(self.baseline))) for scenario in scenarios
+        ]
+        offset = 0
+        for batch in self.history():
+            baseline_units = self._total_units(baseline_calculator, batch)
+            for name, batch_calculator in scenario_calculators:
+                scenario_units = self._total_units(batch_calculator, batch)
+                yield {
+                    'scenario': name,
+                    'offset': offset,
+                    'baseline_units': baseline_units,
+                    'scenario_units': scenario_units,
+                    'delta_units': scenario_units - baseline_units,
+                }
+            offset += batch.num_rows
+
+    def summarize(self, scenarios: List[Scenario]) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate the cost impact of each scenario over the whole history.
+
+        Args:
+            scenarios: Scenarios to compare
+
+        Returns:
+            Scenario name to summary with row count, baseline and scenario
+            totals, total delta (minutes), percentage change, and counts of
+            records whose time increased or decreased
+        """
+        totals = {
+            scenario.name: {'rows': 0, 'baseline': 0, 'scenario': 0, 'increased': 0,
+                            'decreased': 0, 'max_increase': 0}
+            for scenario in scenarios
+        }
+        for chunk in self.iter_deltas(scenarios):
+            total = totals[chunk['scenario']]
+            delta = chunk['delta_units']
+            total['rows'] += len(delta)
+            total['baseline'] += sum_units(chunk['baseline_units'])
+            total['scenario'] += sum_units(chunk['scenario_units'])
+            total['increased'] += int(np.count_nonzero(delta > 0))
+            total['decreased'] += int(np.count_nonzero(delta < 0))
+            if len(delta):
+                total['max_increase'] = max(total['max_increase'], int(delta.max()))
+
+        summary = {}
+        for name, total in totals.items():
+            delta_units = total['scenario'] - total['baseline']
+            summary[name] = {
+                'rows': total['rows'],
+                'baseline_total_time': from_fixed_point(total['baseline']),
+                'scenario_total_time': from_fixed_point(total['scenario']),
+                'delta_total_time': _signed_from_fixed_point(delta_units),
+                'delta_percent': round(100 * delta_units / total['baseline'], 2) if total['baseline'] else 0.0,
+                'records_increased': total['increased'],
+                'records_decreased': total['decreased'],
+                'max_record_increase': from_fixed_point(total['max_increase']),
+            }
+        return summary
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    size = 1_000_000
+    history = history_from_columns({
+        'drill_size': rng.uniform(1, 50, size),
+        'length_to_drill': rng.uniform(1, 1000, size),
+        'rpm': rng.uniform(100, 10000, size),
+        'feed_rate': rng.uniform(1, 1000, size),
+        'material_grade': pa.array(
+            rng.choice(['Steel', 'Stainless Steel', 'Titanium', 'Aluminum'], size)
+        ).dictionary_encode(),
+        'number_of_features': rng.integers(1, 101, size),
+    })
+
+    engine = ScenarioEngine(history)
+    scenarios = [
+        Scenario('Setup 6 min', {'default_setup_time': 6.0}),
+        Scenario('Tool wear 3%', {'tool_wear_factor': 0.03}),
+        Scenario('Harder alloys', {'material_factors': {'stainless steel': 1.6, 'titanium': 2.0}}),
+    ]
+
+    print("Scenario Cost Impact:")
+    print("=" * 40)
+    for name, summary in engine.summarize(scenarios).items():
+        print(f"{name}: {summary['delta_total_time']:+.2f} min ({summary['delta_percent']:+.2f}%) "
+              f"over {summary['rows']} records")
@@ -1,5 +1,6 @@
 import pandas as pd
-from calculation_formulas import GunDrillTimeCalculator
+from calculation_formulas import GunDrillTimeCalculator, from_fixed_point
+from batch_calculation import BatchTimeCalculator
 
 # Initialize the calculator
 calculator = GunDrillTimeCalculator()
@@ -59,6 +60,15 @@ test_cases = [
             'material_grade': 'Steel', 'number_of_features': 1, 'tool_wear_consideration': True,
             'wall_thickness_inspection': True, 'grinding_frequency': 10, 'custom_grinding_time': 5.0
         }
+    },
+    # Test 7: Exact fixed-point mode (rounding only at output)
+    {
+        'test_name': 'Exact Fixed-Point Mode',
+        'params': {
+            'drill_size': 10.0, 'length_to_drill': 100.0, 'rpm': 1800, 'feed_rate': 80.0,
+            'material_grade': 'Steel', 'number_of_features': 2, 'tool_wear_consideration': True,
+            'wall_thickness_inspection': True, 'grinding_frequency': 10, 'exact': True
+        }
     }
 ]
 
@@ -67,6 +77,7 @@ for test in test_cases:
     test_name = test['test_name']
     params = test['params']
     result = calculator.calculate_total_standard_time(**params)
+    result.pop('total_standard_time_units', None)
     result['test_name'] = test_name
     results.append(result)
 
@@ -83,4 +94,122 @@ print(df_results.to_string())
 df_results.to_csv("/home/ubuntu/test_results.csv", index=False)
 print("\nTest results saved to /home/ubuntu/test_results.csv")
 
+# Exact mode checks, reported separately from the results table
+batch_calculator = BatchTimeCalculator(calculator)
+exact_cases = [dict(test['params'], exact=True) for test in test_cases]
+exact_units = [calculator.calculate_total_standard_time(**params)['total_standard_time_units']
+               for params in exact_cases]
+batch_columns = {key: [params.get(key) for params in exact_cases]
+                 for key in ('drill_size', 'length_to_drill', 'rpm', 'feed_rate', 'material_grade',
+                             'number_of_features', 'tool_wear_consideration', 'wall_thickness_inspection',
+                             'custom_setup_time', 'custom_grinding_time', 'grinding_frequency')}
+for key in ('custom_setup_time', 'custom_grinding_time'):
+    batch_columns[key] = [float('nan') if value is None else value for value in batch_columns[key]]
+reversed_columns = {key: values[::-1] for key, values in batch_columns.items()}
+split = len(exact_cases) // 2
+split_units = sum(
+    int(batch_calculator.calculate_batch(exact=True, **{key: values[part] for key, values in batch_columns.items()})
+        ['total_standard_time_units'].sum())
+    for part in (slice(None, split), slice(split, None))
+)
+
+# Very low feed rate with long length and many features (beyond int64 intermediates)
+low_feed_params = {
+    'drill_size': 50.0, 'length_to_drill': 1000.0, 'rpm': 10000, 'feed_rate': 0.01,
+    'material_grade': 'Titanium', 'number_of_features': 100
+}
+low_feed_expected = calculator.calculate_total_standard_time(exact=True, **low_feed_params)['total_standard_time']
+low_feed_batch = float(batch_calculator.calculate_batch(exact=True, **low_feed_params)['total_standard_time'][0])
+
+checks = [
+    {'check_name': 'Exact Total - Forward Order', 'expected': from_fixed_point(sum(exact_units)),
+     'actual': batch_calculator.total_standard_time(exact=True, **batch_columns)},
+    {'check_name': 'Exact Total - Reversed Order', 'expected': from_fixed_point(sum(exact_units)),
+     'actual': batch_calculator.total_standard_time(exact=True, **reversed_columns)},
+    {'check_name': 'Exact Total - Split Batches', 'expected': from_fixed_point(sum(exact_units)),
+     'actual': from_fixed_point(split_units)},
+    {'check_name': 'Exact Low Feed Rate (Batch vs Scalar)', 'expected': low_feed_expected,
+     'actual': low_feed_batch},
+]
+for check in checks:
+    check['passed'] = check['expected'] == check['actual']
+
+print("\nExact Mode Checks:")
+print(pd.DataFrame(checks).to_string())
+
+
+
+# Regression checks for the optimized paths (columnar files, incremental
+# reprocessing, response surface), reported separately as well
+import os
+import tempfile
+import pyarrow.parquet as pq
+from columnar_io import write_inputs, process_file
+
+check_directory = tempfile.mkdtemp(prefix="gun_drill_checks_")
+fast_path_checks = []
+
+# Re-costing a previous output with changed parameters must replace the old results
+rounded_columns = {key: [test['params'].get(key) for test in test_cases[:6]] for key in batch_columns}
+inputs_path = os.path.join(check_directory, "inputs.parquet")
+first_path = os.path.join(check_directory, "first_run.parquet")
+recost_path = os.path.join(check_directory, "recost_run.parquet")
+write_inputs(inputs_path, rounded_columns)
+process_file(inputs_path, first_path, calculator)
+recost_calculator = calculator.with_overrides({'default_setup_time': 50.0})
+process_file(first_path, recost_path, recost_calculator)
+recost_expected = BatchTimeCalculator(recost_calculator).calculate_batch(
+    **{key: values[:6] for key, values in batch_columns.items()}
+)['total_standard_time'].tolist()
+recost_actual = pq.read_table(recost_path).column('total_standard_time').to_pylist()
+fast_path_checks.append({'check_name': 'Columnar Re-cost of Previous Output',
+                         'expected': recost_expected, 'actual': recost_actual,
+                         'passed': recost_expected == recost_actual})
+
+# Nulls in required numeric columns are rejected instead of costed
+null_path = os.path.join(check_directory, "null_drill_size.parquet")
+write_inputs(null_path, dict(rounded_columns, drill_size=[None] + rounded_columns['drill_size'][1:]))
+try:
+    process_file(null_path, os.path.join(check_directory, "null_output.parquet"), calculator)
+    null_outcome = 'accepted'
+except ValueError:
+    null_outcome = 'ValueError'
+fast_path_checks.append({'check_name': 'Columnar Null Drill Size', 'expected': 'ValueError',
+                         'actual': null_outcome, 'passed': null_outcome == 'ValueError'})
+
+# Editing one cell to a decimal must only recompute that row, although pandas
+# then infers the whole column as floats
+from incremental_processing import IncrementalProcessor
+csv_path = os.path.join(check_directory, "features.csv")
+
+
+def write_feature_csv(counts):
+    with open(csv_path, 'w') as handle:
+        handle.write("row,number_of_features\n" + "".join(f"{row},{count}\n" for row, count in enumerate(counts)))
+
+
+feature_counts = ['1', '2', '3', '4', '5', '6']
+write_feature_csv(feature_counts)
+processor = IncrementalProcessor(os.path.join(check_directory, "features_cache.json"),
+                                 lambda row, index: row['number_of_features'] * 2, calculator)
+processor.run_csv(csv_path)
+feature_counts[2] = '3.5'
+write_feature_csv(feature_counts)
+processor.run_csv(csv_path)
+fast_path_checks.append({'check_name': 'Incremental Decimal Edit Recomputes One Row', 'expected': 1,
+                         'actual': processor.last_run_stats['recomputed'],
+                         'passed': processor.last_run_stats['recomputed'] == 1})
+
+# The front end's 1800 rpm drill preset, converted to mm the obvious way, is
+# answered from the response surface and matches the calculator
+from response_surface import ResponseSurface, MM_PER_INCH
+surface = ResponseSurface(calculator=calculator)
+preset = {'drill_size': 0.375 * MM_PER_INCH, 'length_to_drill': 0.73 * MM_PER_INCH, 'rpm': 1800,
+          'feed_rate': 0.8 * MM_PER_INCH, 'material_grade': 'Steel'}
+preset_lookup = surface.lookup(**preset)
+preset_expected = calculator.calculate_total_standard_time(**preset)['total_standard_time']
+fast_path_checks.append({'check_name': 'Response Surface Front-End Preset', 'expected': preset_expected,
+                         'actual': preset_lookup, 'passed': preset_lookup == preset_expected})
 
+print("\nFast Path Checks:")
+print(pd.DataFrame(fast_path_checks).to_string())
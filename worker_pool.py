@@ -0,0 +1,539 @@
+"""
+Gun Drill Machine Standard Time Calculator - Prewarmed Worker Pool
+This module serves interactive calculation requests from a pool of
+long-lived, prewarmed calculator processes. Requests and results travel
+through per-worker shared-memory ring buffers of fixed-layout records
+instead of pickled dictionaries; semaphores only carry the wake-ups.
+A monitor thread checks worker liveness and heartbeats and restarts any
+worker that dies or hangs, replaying its unanswered requests; requests to
+a worker that never finishes warming up are failed instead.
+
+Usage:
+    python worker_pool.py [--workers N] [--requests N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from batch_calculation import RESULT_FIELDS
+from calculation_formulas import GunDrillTimeCalculator
+
+# Fixed-layout records exchanged through shared memory
+REQUEST_DTYPE = np.dtype([
+    ('drill_size', np.float64),
+    ('length_to_drill', np.float64),
+    ('rpm', np.float64),
+    ('feed_rate', np.float64),
+    ('material_code', np.int64),
+    ('number_of_features', np.int64),
+    ('tool_wear_consideration', np.bool_),
+    ('wall_thickness_inspection', np.bool_),
+    ('exact', np.bool_),
+    ('custom_setup_time', np.float64),
+    ('custom_grinding_time', np.float64),
+    ('grinding_frequency', np.int64),
+])
+# detail carries the error text, or the decimal units when they exceed int64
+# (finite exact totals need at most about 320 digits)
+RESPONSE_DTYPE = np.dtype(
+    [(field, np.float64) for field in RESULT_FIELDS]
+    + [('total_standard_time_units', np.int64), ('status', np.int64), ('detail', 'S384')]
+)
+
+# Ring header slots (int64)
+_HEAD = 0        # requests consumed by the worker
+_TAIL = 1        # requests published by the client
+_HEARTBEAT = 2   # worker's last sign of life (time.time_ns)
+_READY = 3       # set once the worker has warmed up
+_HEADER_SIZE = 4
+
+_STATUS_OK = 0
+_STATUS_ERROR = 1
+_STATUS_WIDE_UNITS = 2  # OK, with total_standard_time_units in detail
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+# Worker wake-up interval while idle; also the heartbeat period
+_IDLE_WAIT = 0.1
+
+
+def _ring_views(buffer: memoryview, capacity: int):
+    """Numpy views of the header, request and response arrays of a ring."""
+    header = np.ndarray((_HEADER_SIZE,), dtype=np.int64, buffer=buffer, offset=0)
+    offset = header.nbytes
+    requests = np.ndarray((capacity,), dtype=REQUEST_DTYPE, buffer=buffer, offset=offset)
+    offset += requests.nbytes
+    responses = np.ndarray((capacity,), dtype=RESPONSE_DTYPE, buffer=buffer, offset=offset)
+    return header, requests, responses
+
+
+def _ring_size(capacity: int) -> int:
+    """Bytes of shared memory needed for a ring."""
+    return _HEADER_SIZE * 8 + capacity * (REQUEST_DTYPE.itemsize + RESPONSE_DTYPE.itemsize)
+
+
+def _build_calculator(overrides: Dict[str, Any]) -> GunDrillTimeCalculator:
+    """Calculator for a worker pool (profile-style parameter overrides)."""
+    return GunDrillTimeCalculator().with_overrides(overrides)
+
+
+def _worker_main(shm_name: str, capacity: int, request_ready, response_ready, overrides: Dict[str, Any]):
+    """
+    Worker process loop: serve requests from the ring until terminated.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    header, requests, responses = _ring_views(shm.buf, capacity)
+    calculator = _build_calculator(overrides)
+    materials = list(calculator.material_factors) + ['']
+
+    # Prewarm: run the full calculation once before accepting work
+    calculator.calculate_total_standard_time(10.0, 100.0, 1800, 80.0, 'Steel')
+    calculator.calculate_total_standard_time(10.0, 100.0, 1800, 80.0, 'Steel', exact=True)
+    header[_HEARTBEAT] = time.time_ns()
+    header[_READY] = 1
+
+    while True:
+        if not request_ready.acquire(timeout=_IDLE_WAIT):
+            header[_HEARTBEAT] = time.time_ns()
+            continue
+        header[_HEARTBEAT] = time.time_ns()
+        slot = int(header[_HEAD]) % capacity
+        request = requests[slot]
+        response = responses[slot]
+        try:
+            custom_setup_time = float(request['custom_setup_time'])
+            custom_grinding_time = float(request['custom_grinding_time'])
+            result = calculator.calculate_total_standard_time(
+                float(request['drill_size']),
+                float(request['length_to_drill']),
+                float(request['rpm']),
+                float(request['feed_rate']),
+                materials[min(int(request['material_code']), len(materials) - 1)],
+                number_of_features=int(request['number_of_features']),
+                tool_wear_consideration=bool(request['tool_wear_consideration']),
+                wall_thickness_inspection=bool(request['wall_thickness_inspection']),
+                custom_setup_time=None if custom_setup_time != custom_setup_time else custom_setup_time,
+                custom_grinding_time=None if custom_grinding_time != custom_grinding_time else custom_grinding_time,
+                grinding_frequency=int(request['grinding_frequency']),
+                exact=bool(request['exact'])
+            )
+            for field in RESULT_FIELDS:
+                response[field] = result[field]
+            units = result.get('total_standard_time_units', 0)
+            if abs(units) <= _INT64_MAX:
+                response['total_standard_time_units'] = units
+                response['status'] = _STATUS_OK
+            else:
+                response['detail'] = str(units).encode('ascii')
+                response['status'] = _STATUS_WIDE_UNITS
+        except Exception as error:
+            # Truncated to the field size by numpy
+            response['detail'] = f"{type(error).__name__}: {error}".encode('utf-8', 'replace')
+            response['status'] = _STATUS_ERROR
+        header[_HEAD] += 1
+        response_ready.release()
+
+
+class _Worker:
+    """
+    One worker process with its shared-memory ring and dispatcher thread.
+    """
+
+    def __init__(self, pool: 'WorkerPool', index: int):
+        """Create the worker; call start() to launch it."""
+        self.pool = pool
+        self.index = index
+        self.lock = threading.Lock()
+        self.free_slots = threading.Semaphore(pool.capacity)
+        self.pending = deque()  # (future, request record) in ring order
+        self.answered = 0  # responses read from the current ring
+        self.generation = 0
+        self.restarts = 0
+        self.started_at = 0.0
+        self.process = None
+        self.shm = None
+        self.header = self.requests = self.responses = None
+        self.request_ready = self.response_ready = None
+        self.dispatcher = threading.Thread(
+            target=self._dispatch, name=f"worker-{index}-dispatcher", daemon=True
+        )
+
+    def _launch(self) -> tuple:
+        """Create a fresh ring and launch a worker process on it."""
+        context = self.pool.context
+        capacity = self.pool.capacity
+        shm = shared_memory.SharedMemory(create=True, size=_ring_size(capacity))
+        views = _ring_views(shm.buf, capacity)
+        views[0][:] = 0
+        request_ready = context.Semaphore(0)
+        response_ready = context.Semaphore(0)
+        process = context.Process(
+            target=_worker_main,
+            args=(shm.name, capacity, request_ready, response_ready, self.pool.overrides),
+            name=f"gun-drill-worker-{self.index}",
+            daemon=True
+        )
+        process.start()
+        return shm, views, request_ready, response_ready, process, time.monotonic()
+
+    def _install(self, launched: tuple) -> tuple:
+        """Switch to a launched ring and process (lock held); returns the previous ones."""
+        previous = (self.shm, self.process)
+        self.shm, (self.header, self.requests, self.responses), self.request_ready, \
+            self.response_ready, self.process, self.started_at = launched
+        self.answered = 0
+        self.generation += 1
+        return previous
+
+    def start(self):
+        """Create a fresh ring and launch the worker process."""
+        with self.lock:
+            self._install(self._launch())
+
+    def is_ready(self) -> bool:
+        """Whether the current worker process has finished warming up."""
+        return bool(self.header[_READY])
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait until the worker has finished warming up."""
+        deadline = time.monotonic() + timeout
+        while not self.header[_READY]:
+            if time.monotonic() > deadline or not self.process.is_alive():
+                return False
+            time.sleep(0.005)
+        return True
+
+    def _publish(self, record: np.void):
+        """Write a request into the ring and wake the worker (lock held)."""
+        tail = int(self.header[_TAIL])
+        self.requests[tail % self.pool.capacity] = record
+        self.header[_TAIL] = tail + 1
+        self.request_ready.release()
+
+    def submit(self, record: np.void) -> Future:
+        """Queue a request record; the future resolves with the result dict."""
+        future = Future()
+        self.free_slots.acquire()
+        with self.lock:
+            self.pending.append((future, record))
+            self._publish(record)
+        return future
+
+    def _dispatch(self):
+        """Resolve futures as the worker reports completed requests."""
+        while not self.pool.closed:
+            with self.lock:
+                generation, response_ready = self.generation, self.response_ready
+            if not response_ready.acquire(timeout=_IDLE_WAIT):
+                continue
+            with self.lock:
+                if generation != self.generation or not self.pending:
+                    continue
+                future, record = self.pending.popleft()
+                response = self.responses[self.answered % self.pool.capacity].copy()
+                self.answered += 1
+            self.free_slots.release()
+            status = response['status']
+            if status == _STATUS_ERROR:
+                detail = bytes(response['detail']).decode('utf-8', 'replace')
+                future.set_exception(ValueError(f"Calculation failed for the given parameters: {detail}"))
+                continue
+            result = {field: float(response[field]) for field in RESULT_FIELDS}
+            result['tool_wear_factor_applied'] = bool(record['tool_wear_consideration'])
+            result['number_of_features'] = int(record['number_of_features'])
+            if record['exact']:
+                if status == _STATUS_WIDE_UNITS:
+                    result['total_standard_time_units'] = int(bytes(response['detail']))
+                else:
+                    result['total_standard_time_units'] = int(response['total_standard_time_units'])
+            future.set_result(result)
+
+    def is_healthy(self) -> bool:
+        """
+        Whether the process is alive and sending heartbeats, or still within
+        start_timeout of its launch while warming up.
+        """
+        if not self.process.is_alive():
+            return False
+        if not self.is_ready():
+            return time.monotonic() - self.started_at < self.pool.start_timeout
+        age = (time.time_ns() - int(self.header[_HEARTBEAT])) / 1e9
+        return age < self.pool.heartbeat_timeout
+
+    def restart(self, replay: bool = True):
+        """
+        Replace the worker process and ring.
+
+        The replacement is launched without holding the lock and is not
+        waited for; if it does not warm up within start_timeout, is_healthy
+        reports it and it is replaced in turn.
+
+        Args:
+            replay: Republish unanswered requests to the new ring; otherwise
+                fail them (used when the previous process never started)
+        """
+        launched = self._launch()
+        failed = []
+        with self.lock:
+            if self.pool.closed:
+                previous = launched[0], launched[4]
+            else:
+                previous = self._install(launched)
+                self.restarts += 1
+                if replay:
+                    for _, record in self.pending:
+                        self._publish(record)
+                else:
+                    failed = list(self.pending)
+                    self.pending.clear()
+        launched = None  # drop the ring views so the old ring can be closed
+        for future, _ in failed:
+            self.free_slots.release()
+            future.set_exception(RuntimeError(f"Worker {self.index} failed to start"))
+        self._stop(*previous)
+
+    @staticmethod
+    def _stop(shm: Optional[shared_memory.SharedMemory], process):
+        """Terminate a process and release its ring."""
+        if process is not None and process.is_alive():
+            process.kill()
+        if process is not None:
+            process.join(timeout=1.0)
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        """Stop the worker and fail any unanswered requests."""
+        with self.lock:
+            shm, self.shm = self.shm, None
+            self.header = self.requests = self.responses = None
+            self._stop(shm, self.process)
+            while self.pending:
+                future, _ = self.pending.popleft()
+                future.set_exception(RuntimeError("Worker pool closed"))
+
+
+class WorkerPool:
+    """
+    Pool of prewarmed calculator processes with shared-memory ring buffers.
+
+    Example:
+        with WorkerPool(workers=4) as pool:
+            result = pool.calculate(drill_size=10.0, length_to_drill=100.0,
+                                    rpm=1800, feed_rate=80.0, material_grade='Steel')
+    """
+
+    def __init__(self,
+                 workers: int = 4,
+                 capacity: int = 256,
+                 overrides: Optional[Dict[str, Any]] = None,
+                 heartbeat_timeout: float = 2.0,
+                 health_interval: float = 0.25,
+                 start_timeout: float = 30.0,
+                 start_method: str = 'spawn'):
+        """
+        Start the pool and wait for every worker to warm up.
+
+        Args:
+            workers: Number of worker processes
+            capacity: Ring slots per worker (max in-flight requests per worker)
+            overrides: Calculator parameter overrides, as for a calculator profile
+            heartbeat_timeout: Seconds without a heartbeat before a restart
+            health_interval: Seconds between health checks
+            start_timeout: Seconds to wait for a worker to warm up
+            start_method: multiprocessing start method
+        """
+        self.capacity = capacity
+        self.overrides = overrides or {}
+        self.heartbeat_timeout = heartbeat_timeout
+        self.health_interval = health_interval
+        self.start_timeout = start_timeout
+        self.context = multiprocessing.get_context(start_method)
+        self.closed = False
+        self.material_names = list(_build_calculator(self.overrides).material_factors)
+        self._material_codes = {name: code for code, name in enumerate(self.material_names)}
+        self._next_worker = 0
+
+        self.workers: List[_Worker] = [_Worker(self, index) for index in range(workers)]
+        for worker in self.workers:
+            worker.start()
+        for worker in self.workers:
+            if not worker.wait_ready(start_timeout):
+                self.close()
+                raise RuntimeError(f"Worker {worker.index} failed to start")
+            worker.dispatcher.start()
+
+        self._monitor = threading.Thread(target=self._monitor_health, name="worker-pool-monitor", daemon=True)
+        self._monitor.start()
+
+    def _monitor_health(self):
+        """Restart workers that died or stopped sending heartbeats."""
+        while not self.closed:
+            time.sleep(self.health_interval)
+            for worker in self.workers:
+                if not self.closed and not worker.is_healthy():
+                    worker.restart(replay=worker.is_ready())
+
+    def _encode(self,
+                drill_size: float,
+                length_to_drill: float,
+                rpm: float,
+                feed_rate: float,
+                material_grade: str,
+                number_of_features: int = 1,
+                tool_wear_consideration: bool = True,
+                wall_thickness_inspection: bool = False,
+                custom_setup_time: Optional[float] = None,
+                custom_grinding_time: Optional[float] = None,
+                grinding_frequency: int = 10,
+                exact: bool = False) -> np.void:
+        """Pack calculate_total_standard_time arguments into a request record."""
+        record = np.zeros((), dtype=REQUEST_DTYPE)
+        record['drill_size'] = drill_size
+        record['length_to_drill'] = length_to_drill
+        record['rpm'] = rpm
+        record['feed_rate'] = feed_rate
+        record['material_code'] = self._material_codes.get(material_grade.lower(), len(self.material_names))
+        record['number_of_features'] = number_of_features
+        record['tool_wear_consideration'] = tool_wear_consideration
+        record['wall_thickness_inspection'] = wall_thickness_inspection
+        record['exact'] = exact
+        record['custom_setup_time'] = np.nan if custom_setup_time is None else custom_setup_time
+        record['custom_grinding_time'] = np.nan if custom_grinding_time is None else custom_grinding_time
+        record['grinding_frequency'] = grinding_frequency
+        return record[()]
+
+    def submit(self, **kwargs: Any) -> Future:
+        """
+        Submit a calculation without waiting for it.
+
+        Args:
+            **kwargs: Arguments for GunDrillTimeCalculator.calculate_total_standard_time
+
+        Returns:
+            Future resolving to the result dictionary
+        """
+        if self.closed:
+            raise RuntimeError("Worker pool closed")
+        record = self._encode(**kwargs)
+        worker = min(self.workers, key=lambda candidate: len(candidate.pending))
+        return worker.submit(record)
+
+    def calculate(self, timeout: Optional[float] = None, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Calculate the total standard time on a pool worker.
+
+        Args:
+            timeout: Seconds to wait for the result
+            **kwargs: Arguments for GunDrillTimeCalculator.calculate_total_standard_time
+
+        Returns:
+            Dictionary containing detailed time breakdown
+        """
+        return self.submit(**kwargs).result(timeout)
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Status of every worker: pid, liveness, heartbeat age, load and restarts."""
+        status = []
+        for worker in self.workers:
+            header = worker.header
+            heartbeat = int(header[_HEARTBEAT]) if header is not None else 0
+            status.append({
+                'worker': worker.index,
+                'pid': worker.process.pid if worker.process is not None else None,
+                'alive': worker.process is not None and worker.process.is_alive(),
+                'heartbeat_age': (time.time_ns() - heartbeat) / 1e9 if heartbeat else None,
+                'pending': len(worker.pending),
+                'restarts': worker.restarts,
+            })
+        return status
+
+    def close(self):
+        """Stop all workers and release their shared memory."""
+        if self.closed:
+            return
+        self.closed = True
+        for worker in self.workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def benchmark(pool: WorkerPool, requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    Measure request latency on localhost with concurrent synchronous clients.
+
+    Args:
+        pool: Running worker pool
+        requests: Total number of requests
+        concurrency: Number of client threads
+
+    Returns:
+        Dictionary with throughput and p50/p99/max latency in milliseconds
+    """
+    rng = np.random.default_rng(concurrency)
+    cases = [{
+        'drill_size': float(rng.uniform(1, 50)),
+        'length_to_drill': float(rng.uniform(1, 1000)),
+        'rpm': float(rng.uniform(100, 10000)),
+        'feed_rate': float(rng.uniform(1, 1000)),
+        'material_grade': str(rng.choice(['Steel', 'Titanium', 'Aluminum'])),
+        'number_of_features': int(rng.integers(1, 101)),
+    } for _ in range(requests)]
+
+    def timed(case):
+        start = time.perf_counter()
+        pool.calculate(**case)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = np.array(list(executor.map(timed, cases))) * 1000
+    elapsed = time.perf_counter() - start
+
+    return {
+        'concurrency': concurrency,
+        'throughput': requests / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+    }
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the calculator worker pool")
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    with WorkerPool(workers=args.workers) as worker_pool:
+        print("Worker Pool Latency (localhost):")
+        print("=" * 40)
+        for clients in (1, 8, 32, 128):
+            stats = benchmark(worker_pool, args.requests, clients)
+            print(f"{clients:>4} clients: {stats['throughput']:>9,.0f} req/s  "
+                  f"p50 {stats['p50_ms']:.3f} ms  p99 {stats['p99_ms']:.3f} ms  max {stats['max_ms']:.3f} ms")
+
+        victim = worker_pool.workers[0].process
+        victim.kill()
+        victim.join()
+        result = worker_pool.calculate(timeout=10, drill_size=10.0, length_to_drill=100.0,
+                                       rpm=1800, feed_rate=80.0, material_grade='Steel')
+        time.sleep(worker_pool.health_interval * 4)
+        restarts = sum(status['restarts'] for status in worker_pool.health())
+        print(f"After killing a worker: total {result['total_standard_time']}, restarts {restarts}")